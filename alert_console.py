@@ -0,0 +1,363 @@
+"""
+alert_console.py
+Alert Console - Renders alerts on a background thread so scans never wait on console I/O
+Alerts are queued (bounded), written in batches and rate-limited with "N more alerts suppressed" summaries
+"""
+
+import sys
+import time
+import queue
+import atexit
+import threading
+
+
+# Verbosity levels - quiet prints nothing, brief one line per alert, detailed the full block
+QUIET = 0
+BRIEF = 1
+DETAILED = 2
+VERBOSITY_LEVELS = {'quiet': QUIET, 'brief': BRIEF, 'detailed': DETAILED}
+
+# Alerts waiting to be rendered - beyond this, new alerts are dropped (and counted)
+QUEUE_SIZE = 10000
+
+# Alerts rendered into one write() call
+BATCH_SIZE = 256
+
+# Alerts rendered per second - the rest are counted and summarized
+MAX_ALERTS_PER_SECOND = 200
+
+# Seconds between "N more alerts suppressed" summaries
+SUMMARY_INTERVAL = 1.0
+
+# ANSI color codes
+COLORS = {
+    'CRITICAL': '\033[91m',  # Bright Red
+    'HIGH': '\033[93m',  # Yellow
+    'MEDIUM': '\033[94m',  # Blue
+    'LOW': '\033[92m',  # Green
+    'RESET': '\033[0m'
+}
+
+
+def format_alert(alert, verbosity=DETAILED):
+    """
+    Render an alert as colored console text
+    Returns: String ending in a newline (empty when quiet)
+    """
+    if verbosity <= QUIET:
+        return ''
+
+    severity = alert.get('severity', 'LOW')
+    color = COLORS.get(severity, COLORS['RESET'])
+    reset = COLORS['RESET']
+    header = f"{color}[{severity}] {alert.get('type', 'Alert')}{reset}"
+
+    if verbosity == BRIEF:
+        subject = alert.get('process_name') or alert.get('service_name') or alert.get('chain') or ''
+        return f"{header} {subject}\n" if subject else header + "\n"
+
+    lines = [header, f"  └─ {alert.get('description', 'No description')}"]
+
+    # Relevant details based on alert type
+    if 'process_name' in alert:
+        lines.append(f"     Process: {alert['process_name']} (PID: {alert.get('pid', 'N/A')})")
+    if 'parent_name' in alert and 'child_name' in alert:
+        lines.append(f"     Chain: {alert['parent_name']} → {alert['child_name']}")
+    if 'chain' in alert:
+        lines.append(f"     Chain: {alert['chain']}")
+    if 'path' in alert and alert['path']:
+        lines.append(f"     Path: {alert['path'][:80]}...")
+    if 'service_name' in alert:
+        lines.append(f"     Service: {alert.get('display_name') or alert['service_name']} ({alert['service_name']})")
+
+    lines.append("")  # Blank line for readability
+    return "\n".join(lines) + "\n"
+
+
+class ConsoleWriter:
+    """
+    Background alert renderer
+
+    submit() only enqueues - it never blocks on the console. The writer thread
+    drains the queue in batches, renders each batch into one write() call, and
+    renders at most max_rate alerts per second; alerts over the rate, or
+    dropped because the queue was full, are reported as a single summary line
+    per interval. An alert that fails to render is counted and skipped, so one
+    malformed alert cannot stop the thread. The thread starts on the first submit();
+    whatever is still queued is flushed at interpreter exit.
+    stream: Output file, or None for the current sys.stdout
+    """
+
+    def __init__(self, verbosity=DETAILED, max_rate=MAX_ALERTS_PER_SECOND, queue_size=QUEUE_SIZE,
+                 batch_size=BATCH_SIZE, stream=None):
+        self.verbosity = verbosity
+        self.max_rate = max_rate
+        self.batch_size = batch_size
+        self.stream = stream
+        self.queue = queue.Queue(queue_size)
+        self.thread = None
+        self._start_lock = threading.Lock()
+
+        self.submitted = 0
+        self.dropped = 0  # Written by submitters only
+        self.rate_limited = 0
+        self.failed = 0
+        self.writes = 0
+        self._reported = 0  # Dropped + rate-limited alerts already summarized
+        self._reported_failed = 0
+        self._window_start = 0.0
+        self._window_count = 0
+
+    def submit(self, alert):
+        """
+        Queue an alert for rendering (never blocks)
+        Returns: False if the alert was dropped (quiet mode or full queue)
+        """
+        if self.verbosity <= QUIET:
+            return False
+        if self.thread is None:
+            self._start()
+        try:
+            self.queue.put_nowait(alert)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def flush(self, timeout=5.0):
+        """
+        Wait until everything queued so far has been written (and summarized)
+        Returns: True if the writer caught up within timeout
+        """
+        if self.thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self.queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _start(self):
+        with self._start_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='alert-console', daemon=True)
+                self.thread.start()
+                # A daemon thread dies with the interpreter - don't lose the queue's tail
+                atexit.register(self.flush)
+
+    def _run(self):
+        last_summary = time.monotonic()
+        while True:
+            try:
+                batch = [self.queue.get(timeout=SUMMARY_INTERVAL)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            chunks = []
+            flushes = []
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    flushes.append(item)
+                elif self._allow():
+                    try:
+                        chunks.append(format_alert(item, self.verbosity))
+                    except Exception:
+                        self.failed += 1
+                else:
+                    self.rate_limited += 1
+
+            current = time.monotonic()
+            if flushes or current - last_summary >= SUMMARY_INTERVAL:
+                summary = self._summary_line()
+                if summary:
+                    chunks.append(summary)
+                last_summary = current
+
+            if chunks:
+                self._write(''.join(chunks))
+            for done in flushes:
+                done.set()
+
+    def _allow(self):
+        """
+        Rate limit - at most max_rate alerts per one-second window
+        """
+        if not self.max_rate:
+            return True
+        current = time.monotonic()
+        if current - self._window_start >= 1.0:
+            self._window_start = current
+            self._window_count = 0
+        self._window_count += 1
+        return self._window_count <= self.max_rate
+
+    def _summary_line(self):
+        lines = []
+        unreported = self.dropped + self.rate_limited - self._reported
+        if unreported > 0:
+            self._reported += unreported
+            lines.append(f"[!] {unreported} more alerts suppressed (console output limited)\n")
+        unreported_failed = self.failed - self._reported_failed
+        if unreported_failed > 0:
+            self._reported_failed += unreported_failed
+            lines.append(f"[!] {unreported_failed} alerts could not be displayed (malformed alert)\n")
+        return ''.join(lines)
+
+    def _write(self, text):
+        stream = self.stream or sys.stdout
+        try:
+            stream.write(text)
+            stream.flush()
+            self.writes += 1
+        except (OSError, ValueError):
+            # Console closed (e.g. during interpreter shutdown) - nothing to report to
+            pass
+
+    def get_stats(self):
+        """
+        Output counts
+        Returns: Dictionary of stats
+        """
+        return {
+            'verbosity': self.verbosity,
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'rate_limited': self.rate_limited,
+            'failed': self.failed,
+            'queued': self.queue.qsize(),
+            'writes': self.writes
+        }
+
+
+# Shared writer - one console, one thread, however many AlertManagers
+_CONSOLE = None
+
+
+def get_console():
+    """
+    The shared ConsoleWriter (created on first use)
+    Returns: ConsoleWriter
+    """
+    global _CONSOLE
+    if _CONSOLE is None:
+        _CONSOLE = ConsoleWriter()
+    return _CONSOLE
+
+
+def configure_console(verbosity=None, max_rate=None):
+    """
+    Change the shared writer's verbosity ('quiet', 'brief', 'detailed' or a level)
+    and/or its alerts-per-second limit (0 for no limit)
+    Returns: ConsoleWriter
+    """
+    console = get_console()
+    if verbosity is not None:
+        console.verbosity = VERBOSITY_LEVELS[verbosity] if isinstance(verbosity, str) else verbosity
+    if max_rate is not None:
+        console.max_rate = max_rate
+    return console
+
+
+class _SlowConsole:
+    """
+    Stream with a fixed cost per write() call, standing in for a Windows console
+    """
+
+    def __init__(self, write_cost):
+        self.write_cost = write_cost
+        self.chars = 0
+
+    def write(self, text):
+        end = time.perf_counter() + self.write_cost
+        while time.perf_counter() < end:
+            pass
+        self.chars += len(text)
+
+    def flush(self):
+        pass
+
+
+def benchmark_console(count=5000, write_cost=0.0001):
+    """
+    Time add_alert() with alerts printed inline (one write per line, as before)
+    against the background writer, on a console costing write_cost seconds per write
+    Returns: Dictionary with seconds spent in add_alert() and until output finished
+    """
+    import contextlib
+    from alert_sys import AlertManager
+
+    alerts = [{'severity': 'HIGH', 'type': 'Suspicious Process Path', 'pid': i, 'process_name': f'tool{i}.exe',
+               'path': f'C:\\Users\\Public\\tool{i}.exe', 'description': 'Process running from suspicious location'}
+              for i in range(count)]
+    results = {'alerts': count, 'write_cost_ms': write_cost * 1000}
+
+    # Inline: every print() line is its own console write
+    console = _SlowConsole(write_cost)
+    alert_mgr = AlertManager(print_alerts=False, dedup_window=None)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(console):
+        for alert in alerts:
+            alert_mgr.add_alert(dict(alert))
+            for line in format_alert(alert).splitlines():
+                print(line)
+    results['inline_seconds'] = time.perf_counter() - start
+
+    for label, max_rate in (('batched', 0), ('rate_limited', MAX_ALERTS_PER_SECOND)):
+        writer = ConsoleWriter(max_rate=max_rate, queue_size=count + 1, stream=_SlowConsole(write_cost))
+        alert_mgr = AlertManager(dedup_window=None, console=writer)
+        start = time.perf_counter()
+        for alert in alerts:
+            alert_mgr.add_alert(dict(alert))
+        results[f'{label}_add_seconds'] = time.perf_counter() - start
+        writer.flush(timeout=60)
+        results[f'{label}_total_seconds'] = time.perf_counter() - start
+        results[f'{label}_stats'] = writer.get_stats()
+
+    return results
+
+
+# Test function - Only runs when file is executed directly
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("🖥️ ALERT CONSOLE - TEST MODE")
+    print("=" * 60 + "\n")
+
+    sample = {'severity': 'CRITICAL', 'type': 'Suspicious Parent-Child Relationship', 'pid': 4242,
+              'process_name': 'powershell.exe', 'parent_name': 'winword.exe', 'child_name': 'powershell.exe',
+              'description': 'winword.exe spawned powershell.exe'}
+    for name, level in VERBOSITY_LEVELS.items():
+        print(f"--- {name} ---")
+        writer = ConsoleWriter(verbosity=level)
+        writer.submit(sample)
+        writer.flush()
+
+    print("--- rate limit: 50 alerts, 5 per second ---")
+    writer = ConsoleWriter(verbosity=BRIEF, max_rate=5)
+    for i in range(50):
+        writer.submit(dict(sample, process_name=f'tool{i}.exe'))
+    writer.flush()
+
+    print("--- malformed alerts are counted, the writer keeps going ---")
+    writer = ConsoleWriter(verbosity=DETAILED)
+    writer.submit({'severity': 'HIGH', 'type': 'Suspicious Service', 'service_name': 'evilsvc'})
+    writer.submit(None)
+    writer.submit(sample)
+    print(f"   Flushed: {writer.flush()}, failed: {writer.get_stats()['failed']}")
+
+    result = benchmark_console()
+    print(f"\n⏱️ {result['alerts']:,} ALERTS, {result['write_cost_ms']:.1f} ms PER CONSOLE WRITE:")
+    print(f"   Inline print      : {result['inline_seconds']:.2f} s in add_alert()")
+    for label in ('batched', 'rate_limited'):
+        stats = result[f'{label}_stats']
+        print(f"   {label.replace('_', ' ').capitalize():17} : {result[f'{label}_add_seconds']:.2f} s in add_alert(), "
+              f"output done after {result[f'{label}_total_seconds']:.2f} s "
+              f"({stats['writes']} writes, {stats['rate_limited']:,} suppressed)")
+
+    print("\n✅ Alert Console Test Complete!\n")
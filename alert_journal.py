@@ -0,0 +1,382 @@
+"""
+alert_journal.py
+Alert Journal - Append-only JSON Lines file of every alert, written as alerts are raised
+Readers tail or seek by byte offset; exports stream from the journal instead of re-serializing all alerts
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from datetime import datetime
+
+from time_utils import now, format_timestamp, serialize_alert
+
+
+# Bytes buffered before a write reaches the OS
+BUFFER_SIZE = 64 * 1024
+
+# Update records (repeat counts of an earlier alert) start with this - cheap to spot
+# without decoding the line
+UPDATE_PREFIX = b'{"update": '
+
+# Seconds between fsyncs - bounds how much a power loss can take (a process crash loses
+# at most the unflushed buffer)
+FSYNC_INTERVAL = 1.0
+
+
+class AlertJournal:
+    """
+    Append-only JSONL alert log
+
+    Each alert is serialized once, when appended, as one line. Offsets are
+    byte positions of record starts; a reader can remember the offset after
+    the last record it read and later continue from it (tail), so following
+    the journal costs O(new alerts). Buffered records are synced by a
+    background thread at most fsync_interval seconds after they were appended,
+    even if no further alert arrives. A torn last line (crash mid-write) is
+    ignored by readers. Repeats folded by AlertManager's dedup are journaled
+    as small update records ({"update": record offset, "occurrences", "last_seen"})
+    that readers and exports fold into the alert they refer to.
+    """
+
+    def __init__(self, path, fsync_interval=FSYNC_INTERVAL, buffer_size=BUFFER_SIZE):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _drop_torn_record(path)
+        self.file = open(path, 'ab', buffering=buffer_size)
+        self.offset = self.file.tell()  # End of the last complete record
+        self.has_updates = self.offset > 0  # A reopened journal may hold update records
+        self.appended = 0
+        self.updates = 0
+        self.fsyncs = 0
+        self.last_sync = time.monotonic()
+        self.dirty = False  # Records appended since the last sync
+        self.lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name='alert-journal-sync', daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def for_run(cls, directory, **options):
+        """
+        New journal file for one scan run (alerts_YYYYmmdd_HHMMSS.jsonl in directory)
+        Returns: AlertJournal
+        """
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        return cls(os.path.join(directory, f'alerts_{stamp}.jsonl'), **options)
+
+    def append(self, alert):
+        """
+        Append an alert (buffered - synced to disk every fsync_interval seconds)
+        Returns: Byte offset of the record
+        """
+        line = (json.dumps(serialize_alert(alert), ensure_ascii=False) + '\n').encode('utf-8')
+        record_offset = self._write(line)
+        self.appended += 1
+        return record_offset
+
+    def append_update(self, record_offset, fields):
+        """
+        Record changed fields (e.g. occurrences, last_seen) of the alert at record_offset
+        Returns: Byte offset of the update record
+        """
+        update = {'update': record_offset}
+        update.update(serialize_alert(fields))
+        offset = self._write((json.dumps(update, ensure_ascii=False) + '\n').encode('utf-8'))
+        self.updates += 1
+        self.has_updates = True
+        return offset
+
+    def _write(self, line):
+        with self.lock:
+            record_offset = self.offset
+            self.file.write(line)
+            self.offset += len(line)
+            self.dirty = True
+            if time.monotonic() - self.last_sync >= self.fsync_interval:
+                self._sync()
+        return record_offset
+
+    def sync(self):
+        """
+        Flush buffered records and fsync them to disk
+        """
+        with self.lock:
+            self._sync()
+
+    def _sync(self):
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.fsyncs += 1
+        self.dirty = False
+        self.last_sync = time.monotonic()
+
+    def _flush_loop(self):
+        # A burst followed by silence must not leave records in the buffer
+        while not self._closed.wait(self.fsync_interval):
+            with self.lock:
+                if self.dirty and time.monotonic() - self.last_sync >= self.fsync_interval:
+                    self._sync()
+
+    def close(self):
+        """
+        Sync and close the journal (also runs at interpreter exit)
+        """
+        self._closed.set()
+        with self.lock:
+            if not self.file.closed:
+                self._sync()
+                self.file.close()
+        atexit.unregister(self.close)
+
+    def _visible_end(self):
+        # Make buffered records visible to readers (no fsync needed for that)
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+            return self.offset
+
+    def iter_lines(self, offset=0, end=None):
+        """
+        Raw JSON lines from offset up to end (default: the current end)
+        Returns: Iterator of (record offset, line bytes without the newline)
+        """
+        end = self._visible_end() if end is None else end
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            while offset < end:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    break  # Torn record at the end of a crashed run
+                yield offset, line[:-1]
+                offset += len(line)
+
+    def _latest_updates(self, offset, end):
+        """
+        Fields from the update records between offset and end, merged per alert
+        Returns: Dictionary of record offset -> changed fields
+        """
+        updates = {}
+        for _, line in self.iter_lines(offset, end):
+            if line.startswith(UPDATE_PREFIX):
+                fields = json.loads(line)
+                updates.setdefault(fields.pop('update'), {}).update(fields)
+        return updates
+
+    def read(self, offset=0, end=None):
+        """
+        Alerts from offset up to end (default: the current end), with the updates
+        journaled up to end folded in
+        Returns: Iterator of (record offset, alert dict)
+        """
+        end = self._visible_end() if end is None else end
+        updates = self._latest_updates(offset, end) if self.has_updates else {}
+        for record_offset, line in self.iter_lines(offset, end):
+            if line.startswith(UPDATE_PREFIX):
+                continue
+            alert = json.loads(line)
+            if record_offset in updates:
+                alert.update(updates[record_offset])
+            yield record_offset, alert
+
+    def tail(self, offset=0, limit=1000):
+        """
+        Alerts appended at or after offset - each with its record offset in
+        'journal_offset'. Updates to alerts in the batch are folded in; updates to
+        alerts returned by an earlier call are listed separately
+        Returns: (list of alerts, offset to pass next time, list of update records)
+        """
+        alerts = []
+        by_offset = {}
+        updates = []
+        next_offset = offset
+        for record_offset, line in self.iter_lines(offset):
+            if len(alerts) >= limit:
+                break
+            record = json.loads(line)
+            next_offset = record_offset + len(line) + 1
+            if line.startswith(UPDATE_PREFIX):
+                target = by_offset.get(record['update'])
+                if target is not None:
+                    target.update((key, value) for key, value in record.items() if key != 'update')
+                else:
+                    updates.append(record)
+                continue
+            record['journal_offset'] = record_offset
+            by_offset[record_offset] = record
+            alerts.append(record)
+        return alerts, next_offset, updates
+
+    def iter_export_json(self, summary=None, end=None):
+        """
+        Stream the journal as one JSON document (export_json() keys, with the totals
+        after the alerts) without re-serializing any alert - records are copied as written
+        Returns: Iterator of str chunks
+        """
+        end = self._visible_end() if end is None else end
+        # One pass for the repeat counts, so alerts can still be copied in order
+        updates = self._latest_updates(0, end) if self.has_updates else {}
+        yield '{\n    "generated_at": %s,\n    "alerts": [\n' % json.dumps(format_timestamp(now()))
+        count = 0
+        for record_offset, line in self.iter_lines(0, end):
+            if line.startswith(UPDATE_PREFIX):
+                continue
+            if record_offset in updates:
+                alert = json.loads(line)
+                alert.update(updates[record_offset])
+                text = json.dumps(alert, ensure_ascii=False)
+            else:
+                text = line.decode('utf-8')
+            yield (',\n        ' if count else '        ') + text
+            count += 1
+        tail = {'total_alerts': count}
+        if summary is not None:
+            tail['summary'] = summary
+        yield '\n    ],\n    %s\n}\n' % json.dumps(tail, ensure_ascii=False)[1:-1]
+
+    def export_json(self, filename, summary=None):
+        """
+        Write the streamed JSON export to a file
+        """
+        with open(filename, 'w', encoding='utf-8') as f:
+            for chunk in self.iter_export_json(summary):
+                f.write(chunk)
+
+    def get_stats(self):
+        """
+        Journal size and write counts
+        Returns: Dictionary of stats
+        """
+        return {
+            'path': self.path,
+            'bytes': self.offset,
+            'appended': self.appended,
+            'updates': self.updates,
+            'fsyncs': self.fsyncs
+        }
+
+
+def _drop_torn_record(path):
+    """
+    Truncate a partial last line left by a crash, so new records start on a line of their own
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'r+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            newline = f.read(step).rfind(b'\n')
+            if newline >= 0:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position < end:
+            f.truncate(position)
+
+
+def benchmark_journal(sizes=(10000, 100000, 500000), new_alerts=100):
+    """
+    Compare AlertManager.export_json() (whole list, indent=4) with the journal:
+    streamed export, and tailing only the alerts added since the last read
+    Returns: List of per-size dictionaries with seconds for each
+    """
+    import io
+    import tempfile
+    import contextlib
+    from alert_sys import AlertManager
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        for size in sizes:
+            journal = AlertJournal(os.path.join(tmp, f'bench_{size}.jsonl'))
+            alert_mgr = AlertManager(dedup_window=None, print_alerts=False, journal=journal)
+            plain_mgr = AlertManager(dedup_window=None, print_alerts=False)
+
+            def make(i):
+                return {'severity': 'HIGH', 'type': 'Suspicious Process Path', 'pid': i,
+                        'process_name': f'tool{i}.exe', 'path': f'C:\\Users\\Public\\tool{i}.exe',
+                        'description': 'Process running from suspicious location'}
+
+            start = time.perf_counter()
+            for i in range(size):
+                plain_mgr.add_alert(make(i))
+            plain_add = time.perf_counter() - start
+            start = time.perf_counter()
+            for i in range(size):
+                alert_mgr.add_alert(make(i))
+            journal_add = time.perf_counter() - start
+
+            export_file = os.path.join(tmp, 'export.json')
+            start = time.perf_counter()
+            plain_mgr.export_json(export_file)
+            full_export = time.perf_counter() - start
+
+            start = time.perf_counter()
+            journal.export_json(export_file, alert_mgr.get_summary())
+            streamed_export = time.perf_counter() - start
+
+            # A reader that is caught up, then picks up only what's new
+            offset = journal.offset
+            for i in range(size, size + new_alerts):
+                alert_mgr.add_alert(make(i))
+            start = time.perf_counter()
+            new, offset, _ = journal.tail(offset)
+            tail_seconds = time.perf_counter() - start
+
+            journal.close()
+            results.append({'alerts': size, 'plain_add_seconds': plain_add, 'journal_add_seconds': journal_add,
+                            'full_export_seconds': full_export, 'streamed_export_seconds': streamed_export,
+                            'tail_seconds': tail_seconds, 'tailed': len(new)})
+    return results
+
+
+# Test function - Only runs when file is executed directly
+if __name__ == "__main__":
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("📓 ALERT JOURNAL - TEST MODE")
+    print("=" * 60 + "\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = AlertJournal(os.path.join(tmp, 'alerts.jsonl'))
+        offsets = [journal.append({'severity': 'HIGH', 'type': 'Test Alert', 'timestamp': now(), 'pid': pid})
+                   for pid in (100, 200, 300)]
+        print(f"   Record offsets: {offsets}")
+        print(f"   Seek to {offsets[1]}: {[alert['pid'] for _, alert in journal.read(offsets[1])]}")
+
+        # A crash mid-write leaves a torn last line - readers stop before it
+        journal.sync()
+        with open(journal.path, 'ab') as f:
+            f.write(b'{"severity": "HI')
+        alerts, next_offset, _ = journal.tail(0)
+        print(f"   Tail from 0 (torn record present): {len(alerts)} alerts, next offset {next_offset}")
+        journal.close()
+
+        # Reopening drops the torn record before appending
+        journal = AlertJournal(journal.path)
+        journal.append({'severity': 'LOW', 'type': 'Test Alert', 'timestamp': now(), 'pid': 400})
+        print(f"   After reopen: {[alert['pid'] for _, alert in journal.read()]}")
+        journal.append_update(offsets[0], {'occurrences': 3, 'last_seen': now()})
+        print(f"   Repeat counts folded in: {[alert.get('occurrences') for _, alert in journal.read()]}")
+        journal.close()
+
+    print("\n⏱️ EXPORT COST (printing disabled):")
+    for result in benchmark_journal():
+        print(f"   {result['alerts']:>7,} alerts: export_json {result['full_export_seconds']:.2f} s, "
+              f"streamed {result['streamed_export_seconds']:.2f} s, "
+              f"tail of {result['tailed']} new {result['tail_seconds'] * 1000:.2f} ms "
+              f"(journaling add_alert: +{(result['journal_add_seconds'] - result['plain_add_seconds']) / result['alerts'] * 1e6:.1f} µs/alert)")
+
+    print("\n✅ Alert Journal Test Complete!\n")
@@ -0,0 +1,350 @@
+"""
+alert_store.py
+Alert Store - SQLite persistence for alerts, with indexed, paginated queries
+Alerts survive restarts; summaries come from a counts table and filters from indexes instead of list scans
+"""
+
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from collections import Counter
+
+
+# Alerts buffered before an insert transaction
+BATCH_SIZE = 1000
+
+# Seconds buffered alerts may wait before being written
+FLUSH_INTERVAL = 0.5
+
+# Default and maximum rows per query page
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Query filters -> indexed columns
+FILTER_COLUMNS = {
+    'severity': 'severity',
+    'alert_type': 'type',
+    'pid': 'pid',
+    'process_name': 'process_name'
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL,
+    severity TEXT,
+    type TEXT,
+    pid INTEGER,
+    process_name TEXT,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    last_seen REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alerts_severity ON alerts (severity, id);
+CREATE INDEX IF NOT EXISTS alerts_type ON alerts (type, id);
+CREATE INDEX IF NOT EXISTS alerts_pid ON alerts (pid, id);
+CREATE INDEX IF NOT EXISTS alerts_process_name ON alerts (process_name, id);
+CREATE INDEX IF NOT EXISTS alerts_timestamp ON alerts (timestamp);
+CREATE TABLE IF NOT EXISTS alert_counts (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+
+class AlertStore:
+    """
+    SQLite-backed alert storage (WAL mode)
+
+    add() only buffers; buffered alerts are inserted in one transaction when
+    batch_size accumulate or flush_interval has passed (checked on add and by a
+    background thread, so a quiet spell doesn't strand them), and before any query.
+    Per-severity and per-type counts are kept in a counts table updated in the
+    same transaction, so summaries never scan the alerts table. Pages are
+    keyset-paginated on the alert id (pass back 'next_cursor'), so a page
+    costs the same however deep into the table it is.
+
+    One connection, guarded by a lock - scans and dashboard requests run on
+    different threads.
+    """
+
+    def __init__(self, path='alerts.db', batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')  # Durable at checkpoints - safe with WAL
+        self.conn.executescript(SCHEMA)
+        self.next_id = (self.conn.execute('SELECT MAX(id) FROM alerts').fetchone()[0] or 0) + 1
+        self.pending = []
+        self.pending_repeats = {}  # id -> (occurrences, last_seen)
+        self.last_flush = time.monotonic()
+        self.inserted = 0
+        self.transactions = 0
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name='alert-store-flush', daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def __len__(self):
+        return self.count()
+
+    def add(self, alert):
+        """
+        Buffer an alert for insertion
+        Returns: The alert's id in the store
+        """
+        with self.lock:
+            alert_id = self.next_id
+            self.next_id += 1
+            self.pending.append((alert_id, alert.get('timestamp'), alert.get('severity'), alert.get('type'),
+                                 alert.get('pid'), alert.get('process_name'), alert.get('occurrences', 1),
+                                 alert.get('last_seen'), json.dumps(alert, default=str)))
+            if len(self.pending) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+                self.flush()
+        return alert_id
+
+    def record_repeat(self, alert_id, occurrences, last_seen):
+        """
+        Update a stored alert's occurrence count and last sighting (buffered)
+        """
+        with self.lock:
+            self.pending_repeats[alert_id] = (occurrences, last_seen)
+
+    def flush(self):
+        """
+        Write buffered alerts and repeat updates in one transaction
+        """
+        with self.lock:
+            self.last_flush = time.monotonic()
+            if not self.pending and not self.pending_repeats:
+                return
+            counts = Counter()
+            for row in self.pending:
+                counts['severity', row[2]] += 1
+                counts['type', row[3] if row[3] is not None else 'Unknown'] += 1
+
+            with self.conn:
+                self.conn.executemany('INSERT INTO alerts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', self.pending)
+                self.conn.executemany('UPDATE alerts SET occurrences = ?, last_seen = ? WHERE id = ?',
+                                      [(occurrences, last_seen, alert_id) for alert_id, (occurrences, last_seen)
+                                       in self.pending_repeats.items()])
+                self.conn.executemany('INSERT INTO alert_counts VALUES (?, ?, ?) '
+                                      'ON CONFLICT (kind, key) DO UPDATE SET count = count + excluded.count',
+                                      [(kind, str(key), count) for (kind, key), count in counts.items()])
+            self.inserted += len(self.pending)
+            self.transactions += 1
+            self.pending = []
+            self.pending_repeats = {}
+
+    def _flush_loop(self):
+        # Alerts and repeat counts buffered before a lull must still reach the database
+        while not self._closed.wait(self.flush_interval):
+            with self.lock:
+                if self._closed.is_set():
+                    return
+                if time.monotonic() - self.last_flush >= self.flush_interval:
+                    self.flush()
+
+    def count(self):
+        """
+        Returns: Number of stored alerts
+        """
+        return sum(self.get_counts('type').values())
+
+    def get_counts(self, kind):
+        """
+        Alert counts per 'severity' or 'type' (from the counts table)
+        Returns: Dictionary of key -> count
+        """
+        with self.lock:
+            self.flush()
+            return dict(self.conn.execute('SELECT key, count FROM alert_counts WHERE kind = ?', (kind,)))
+
+    def get_summary(self):
+        """
+        Summary in AlertManager.get_summary() format (without suppression counts)
+        Returns: Dictionary with alert statistics
+        """
+        by_severity = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+        for severity, count in self.get_counts('severity').items():
+            if severity in by_severity:
+                by_severity[severity] = count
+        by_type = self.get_counts('type')
+        return {
+            'total_alerts': sum(by_type.values()),
+            'by_severity': by_severity,
+            'by_type': by_type
+        }
+
+    def query(self, severity=None, alert_type=None, pid=None, process_name=None, since=None,
+              cursor=None, limit=PAGE_SIZE, newest_first=False):
+        """
+        One page of alerts matching all given filters
+        since: Only alerts raised at or after this epoch
+        cursor: 'next_cursor' from the previous page
+        Returns: (list of alerts, next_cursor or None on the last page)
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        filters = {'severity': severity, 'alert_type': alert_type, 'pid': pid, 'process_name': process_name}
+        clauses = []
+        params = []
+        for name, value in filters.items():
+            if value is not None:
+                clauses.append(f'{FILTER_COLUMNS[name]} = ?')
+                params.append(value)
+        if since is not None:
+            clauses.append('timestamp >= ?')
+            params.append(since)
+        if cursor is not None:
+            clauses.append('id < ?' if newest_first else 'id > ?')
+            params.append(cursor)
+
+        sql = 'SELECT id, occurrences, last_seen, data FROM alerts'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f" ORDER BY id {'DESC' if newest_first else 'ASC'} LIMIT ?"
+        params.append(limit + 1)
+
+        with self.lock:
+            self.flush()
+            rows = self.conn.execute(sql, params).fetchall()
+
+        alerts = []
+        for _, occurrences, last_seen, data in rows[:limit]:
+            alert = json.loads(data)
+            if 'occurrences' in alert:
+                alert['occurrences'] = occurrences
+                alert['last_seen'] = last_seen
+            alerts.append(alert)
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return alerts, next_cursor
+
+    def iter_alerts(self, page_size=MAX_PAGE_SIZE, **filters):
+        """
+        All alerts matching filters, oldest first, fetched page by page
+        Returns: Iterator of alerts
+        """
+        cursor = None
+        while True:
+            alerts, cursor = self.query(cursor=cursor, limit=page_size, **filters)
+            yield from alerts
+            if cursor is None:
+                return
+
+    def close(self):
+        """
+        Flush and close the database (also runs at interpreter exit)
+        """
+        self._closed.set()
+        with self.lock:
+            if self.conn is not None:
+                self.flush()
+                self.conn.close()
+                self.conn = None
+        atexit.unregister(self.close)
+
+    def get_stats(self):
+        """
+        Insert and transaction counts
+        Returns: Dictionary of stats
+        """
+        return {
+            'path': self.path,
+            'inserted': self.inserted,
+            'transactions': self.transactions,
+            'pending': len(self.pending)
+        }
+
+
+def benchmark_store(count=500000, queries=200, path=None):
+    """
+    Ingest count alerts through AlertManager into a store, then time filtered
+    page queries at random depths
+    Returns: Dictionary with ingest rate and query times in milliseconds
+    """
+    import os
+    import random
+    import tempfile
+    from alert_sys import AlertManager
+
+    types = ['Suspicious Process Path', 'High-Risk Process Detected',
+             'Suspicious Parent-Child Relationship', 'Suspicious Service Configuration']
+    severities = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AlertStore(path or os.path.join(tmp, 'bench.db'))
+        alert_mgr = AlertManager(dedup_window=None, print_alerts=False, store=store, keep_alerts=False)
+        base = time.time()
+
+        start = time.perf_counter()
+        for i in range(count):
+            alert_mgr.add_alert({'severity': severities[rng.randrange(4)], 'type': types[i % 4], 'pid': i % 50000,
+                                 'process_name': f'proc{i % 5000}.exe', 'timestamp': base + i / 1000,
+                                 'path': f'C:\\Users\\Public\\proc{i % 5000}.exe',
+                                 'description': 'Process running from suspicious location'})
+        store.flush()
+        ingest = time.perf_counter() - start
+
+        timings = {}
+        cases = {
+            'severity': lambda: {'severity': rng.choice(severities)},
+            'type + severity': lambda: {'alert_type': rng.choice(types), 'severity': rng.choice(severities)},
+            'pid': lambda: {'pid': rng.randrange(50000)},
+            'process_name': lambda: {'process_name': f'proc{rng.randrange(5000)}.exe'},
+            'since': lambda: {'since': base + rng.randrange(count) / 1000}
+        }
+        for label, make_filters in cases.items():
+            elapsed = []
+            for _ in range(queries):
+                filters = make_filters()
+                cursor = rng.randrange(count) if label != 'since' else None
+                start = time.perf_counter()
+                store.query(cursor=cursor, limit=PAGE_SIZE, **filters)
+                elapsed.append(time.perf_counter() - start)
+            elapsed.sort()
+            timings[label] = {'median_ms': elapsed[len(elapsed) // 2] * 1000,
+                              'p99_ms': elapsed[int(len(elapsed) * 0.99)] * 1000}
+
+        start = time.perf_counter()
+        alert_mgr.get_summary()
+        summary_ms = (time.perf_counter() - start) * 1000
+        store.close()
+
+    return {'alerts': count, 'ingest_per_second': count / ingest, 'queries': timings, 'summary_ms': summary_ms}
+
+
+# Test function - Only runs when file is executed directly
+if __name__ == "__main__":
+    import sys
+
+    print("\n" + "=" * 60)
+    print("🗄️ ALERT STORE - TEST MODE")
+    print("=" * 60 + "\n")
+
+    store = AlertStore(':memory:')
+    for pid, severity in ((100, 'HIGH'), (200, 'CRITICAL'), (300, 'HIGH')):
+        store.add({'severity': severity, 'type': 'Test Alert', 'pid': pid, 'timestamp': time.time()})
+    page, cursor = store.query(severity='HIGH', limit=1)
+    print(f"   First HIGH page: {[alert['pid'] for alert in page]}, next cursor {cursor}")
+    page, cursor = store.query(severity='HIGH', cursor=cursor, limit=1)
+    print(f"   Second HIGH page: {[alert['pid'] for alert in page]}, next cursor {cursor}")
+    print(f"   Summary: {store.get_summary()}")
+    store.close()
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    result = benchmark_store(count)
+    print(f"\n⏱️ {result['alerts']:,} ALERTS:")
+    print(f"   Ingest (through AlertManager): {result['ingest_per_second']:,.0f} alerts/s")
+    for label, timing in result['queries'].items():
+        print(f"   Page query by {label:16}: {timing['median_ms']:.2f} ms median, {timing['p99_ms']:.2f} ms p99")
+    print(f"   get_summary()                : {result['summary_ms']:.2f} ms")
+
+    print("\n✅ Alert Store Test Complete!\n")
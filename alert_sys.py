@@ -4,41 +4,164 @@ Alert Management System - Handles, displays, and exports security alerts
 """
 
 import json
-from datetime import datetime
+from collections import OrderedDict
+
+from alert_console import get_console
+from alert_store import PAGE_SIZE, MAX_PAGE_SIZE
+from alert_tiers import TieredAlertList
+from time_utils import now, format_timestamp, serialize_alert
+
+
+# Alert fields that identify *what* was detected, and in which process - a rescan of
+# the same process (same pid and create_time) repeats the alert, another process with
+# the same name and path does not. Timestamps and descriptions (which can embed counts
+# or lifetimes) vary between sightings of the same finding
+IDENTITY_FIELDS = ('rule_id', 'process_name', 'path', 'pid', 'create_time', 'parent_name', 'parent_pid',
+                   'child_name', 'child_path', 'child_pid', 'child_create_time', 'chain', 'service_name')
+
+# Repeats of an alert within this many seconds of its last sighting are folded into it
+DEFAULT_DEDUP_WINDOW = 3600
+
+
+def alert_fingerprint(alert):
+    """
+    Stable identity of an alert: its type plus the identity fields it has
+    """
+    return (alert.get('type'),) + tuple(alert.get(field) for field in IDENTITY_FIELDS)
 
 
 class AlertManager:
     """
     Manages security alerts with severity levels and categorization
+
+    Alerts are deduplicated by fingerprint: a repeat seen within dedup_window
+    seconds of the last sighting only bumps the stored alert's 'occurrences'
+    and 'last_seen' (and counts as suppressed). Fingerprints expire after the
+    window, so a finding that comes back later raises a fresh alert.
+
+    Per-type counts and per-severity/per-type alert lists are maintained as
+    alerts are added, so summaries cost O(number of types) and filters
+    O(result size) however many alerts are held.
+    dedup_window: Seconds, or None to keep every alert
+    print_alerts: Print each new alert to the console
+    console: ConsoleWriter to print through (default: the shared one, see alert_console)
+    journal: AlertJournal every new alert is appended to (exports then stream from it)
+    store: AlertStore to persist alerts in - summaries and queries then run against it
+    keep_alerts: Also keep alerts in memory (self.alerts) - with a store, False bounds memory
+    memory_budget: Alerts kept in RAM - older ones spill to compressed files in spill_dir
+                   (see alert_tiers). Per-alert indexes are then not kept; filters scan
+                   the tiers, skipping segments by their counts. None keeps everything in RAM
     """
 
-    def __init__(self):
-        self.alerts = []
+    def __init__(self, dedup_window=DEFAULT_DEDUP_WINDOW, print_alerts=True, console=None, journal=None,
+                 store=None, keep_alerts=True, memory_budget=None, spill_dir=None):
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.alerts = self._new_alert_list()
         self.severity_counts = {
             'CRITICAL': 0,
             'HIGH': 0,
             'MEDIUM': 0,
             'LOW': 0
         }
+        self.type_counts = {}
+        self.alerts_by_severity = {}
+        self.alerts_by_type = {}
+        self.print_alerts = print_alerts
+        self.console = console
+        self.journal = journal
+        self.store = store
+        self.keep_alerts = keep_alerts or store is None
+        self.indexed = self.keep_alerts and memory_budget is None
+        self.dedup_window = dedup_window
+        # fingerprint -> [position in self.alerts, id in the store, occurrences, last_seen,
+        # journal record offset], least recently seen first - alerts themselves aren't held
+        # here, so spilled ones can go
+        self.fingerprints = OrderedDict()
+        self.suppressed = 0
+        self.suppressed_by_type = {}
+
+    def _new_alert_list(self):
+        if self.memory_budget:
+            return TieredAlertList(self.memory_budget, self.spill_dir)
+        return []
+
+    def _expire_fingerprints(self, timestamp):
+        """
+        Forget fingerprints whose last sighting is older than the window
+        """
+        cutoff = timestamp - self.dedup_window
+        fingerprints = self.fingerprints
+        while fingerprints:
+            fingerprint, record = next(iter(fingerprints.items()))
+            if record[3] >= cutoff:
+                break
+            del fingerprints[fingerprint]
 
     def add_alert(self, alert):
         """
         Add a new alert to the system
+        Returns: True if it was added, False if it was folded into an earlier alert
         """
-        # Ensure alert has timestamp
+        # Ensure alert has timestamp (epoch - formatted when exported)
         if 'timestamp' not in alert:
-            alert['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            alert['timestamp'] = now()
+
+        if self.dedup_window is not None:
+            seen_at = alert['timestamp']
+            self._expire_fingerprints(seen_at)
+            fingerprint = alert_fingerprint(alert)
+            record = self.fingerprints.get(fingerprint)
+            if record is not None:
+                position, store_id, occurrences, last_seen, journal_offset = record
+                record[2] = occurrences = occurrences + 1
+                record[3] = last_seen = max(last_seen, seen_at)
+                self.fingerprints.move_to_end(fingerprint)
+                if position is not None:
+                    self._update_alert(position, {'occurrences': occurrences, 'last_seen': last_seen})
+                if store_id is not None:
+                    self.store.record_repeat(store_id, occurrences, last_seen)
+                if journal_offset is not None:
+                    self.journal.append_update(journal_offset, {'occurrences': occurrences, 'last_seen': last_seen})
+                self.suppressed += 1
+                alert_type = alert.get('type', 'Unknown')
+                self.suppressed_by_type[alert_type] = self.suppressed_by_type.get(alert_type, 0) + 1
+                return False
+
+            alert['occurrences'] = 1
+            alert['last_seen'] = seen_at
 
-        # Add to alerts list
-        self.alerts.append(alert)
+        journal_offset = self.journal.append(alert) if self.journal is not None else None
+        store_id = self.store.add(alert) if self.store is not None else None
+        if self.dedup_window is not None:
+            position = len(self.alerts) if self.keep_alerts else None
+            self.fingerprints[fingerprint] = [position, store_id, 1, alert['last_seen'], journal_offset]
 
         # Update severity count
         severity = alert.get('severity', 'LOW')
         if severity in self.severity_counts:
             self.severity_counts[severity] += 1
+        alert_type = alert.get('type', 'Unknown')
+        self.type_counts[alert_type] = self.type_counts.get(alert_type, 0) + 1
+
+        # Add to alerts list, with indexes that keep the filters independent of the alert count
+        if self.keep_alerts:
+            self.alerts.append(alert)
+        if self.indexed:
+            self.alerts_by_type.setdefault(alert.get('type'), []).append(alert)
+            self.alerts_by_severity.setdefault(alert.get('severity'), []).append(alert)
 
         # Print alert to console
-        self._print_alert(alert)
+        if self.print_alerts:
+            self._print_alert(alert)
+        return True
+
+    def _update_alert(self, position, fields):
+        # Spilled alerts take the change through the tiered list's side table
+        if isinstance(self.alerts, TieredAlertList):
+            self.alerts.update(position, fields)
+        else:
+            self.alerts[position].update(fields)
 
     def add_multiple_alerts(self, alerts_list):
         """
@@ -49,78 +172,133 @@ class AlertManager:
 
     def _print_alert(self, alert):
         """
-        Print colored alert to console based on severity
+        Queue the alert for the console writer thread (rendering never blocks the scan)
         """
-        # ANSI color codes
-        colors = {
-            'CRITICAL': '\033[91m',  # Bright Red
-            'HIGH': '\033[93m',  # Yellow
-            'MEDIUM': '\033[94m',  # Blue
-            'LOW': '\033[92m',  # Green
-            'RESET': '\033[0m'
-        }
-
-        severity = alert.get('severity', 'LOW')
-        color = colors.get(severity, colors['RESET'])
-        reset = colors['RESET']
-
-        # Print formatted alert
-        print(f"{color}[{severity}] {alert.get('type', 'Alert')}{reset}")
-        print(f"  └─ {alert.get('description', 'No description')}")
-
-        # Print relevant details based on alert type
-        if 'process_name' in alert:
-            print(f"     Process: {alert['process_name']} (PID: {alert.get('pid', 'N/A')})")
-        if 'parent_name' in alert and 'child_name' in alert:
-            print(f"     Chain: {alert['parent_name']} → {alert['child_name']}")
-        if 'path' in alert and alert['path']:
-            print(f"     Path: {alert['path'][:80]}...")
-        if 'service_name' in alert:
-            print(f"     Service: {alert['display_name']} ({alert['service_name']})")
-
-        print()  # Blank line for readability
+        (self.console or get_console()).submit(alert)
 
     def get_summary(self):
         """
-        Get summary statistics of all alerts
+        Get summary statistics of all alerts (from the store when there is one)
         Returns: Dictionary with alert statistics
         """
+        if self.store is not None:
+            summary = self.store.get_summary()
+            summary['suppressed'] = self.suppressed
+            summary['suppressed_by_type'] = dict(self.suppressed_by_type)
+            return summary
+
         summary = {
             'total_alerts': len(self.alerts),
             'by_severity': self.severity_counts.copy(),
-            'by_type': {}
+            'by_type': self.type_counts.copy(),
+            'suppressed': self.suppressed,
+            'suppressed_by_type': dict(self.suppressed_by_type)
         }
-
-        # Count alerts by type
-        for alert in self.alerts:
-            alert_type = alert.get('type', 'Unknown')
-            summary['by_type'][alert_type] = summary['by_type'].get(alert_type, 0) + 1
-
         return summary
 
     def get_alerts_by_severity(self, severity):
         """
         Get all alerts of a specific severity level
         """
-        return [alert for alert in self.alerts if alert.get('severity') == severity]
+        if self.store is not None:
+            return list(self.store.iter_alerts(severity=severity))
+        if not self.indexed:
+            return self._scan_alerts(severity=severity)
+        return list(self.alerts_by_severity.get(severity, ()))
 
     def get_alerts_by_type(self, alert_type):
         """
         Get all alerts of a specific type
         """
-        return [alert for alert in self.alerts if alert.get('type') == alert_type]
+        if self.store is not None:
+            return list(self.store.iter_alerts(alert_type=alert_type))
+        if not self.indexed:
+            return self._scan_alerts(alert_type=alert_type)
+        return list(self.alerts_by_type.get(alert_type, ()))
+
+    def query_alerts(self, severity=None, alert_type=None, pid=None, process_name=None, since=None,
+                     cursor=None, limit=PAGE_SIZE, newest_first=False):
+        """
+        One page of alerts matching all given filters (see AlertStore.query)
+        cursor: 'next_cursor' from the previous page of the same query
+        Returns: (list of alerts, next_cursor or None on the last page)
+        """
+        if self.store is not None:
+            return self.store.query(severity, alert_type, pid, process_name, since, cursor, limit, newest_first)
+
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if not self.indexed:
+            # Cursor is a position in the tiered list; spilled lines are prefiltered on the process name
+            match_text = [json.dumps(process_name, ensure_ascii=False)] if process_name is not None else None
+            entries = self.alerts.iter_from(cursor, newest_first, _segment_filter(severity, alert_type, since),
+                                            match_text)
+        else:
+            if severity is not None:
+                candidates = self.alerts_by_severity.get(severity, [])
+            elif alert_type is not None:
+                candidates = self.alerts_by_type.get(alert_type, [])
+            else:
+                candidates = self.alerts
+
+            # Cursor is a position in the candidate list
+            if newest_first:
+                positions = range(len(candidates) - 1 if cursor is None else cursor - 1, -1, -1)
+            else:
+                positions = range(0 if cursor is None else cursor + 1, len(candidates))
+            entries = ((position, candidates[position]) for position in positions)
+
+        page = []
+        for position, alert in entries:
+            if ((severity is not None and alert.get('severity') != severity)
+                    or (alert_type is not None and alert.get('type') != alert_type)
+                    or (pid is not None and alert.get('pid') != pid)
+                    or (process_name is not None and alert.get('process_name') != process_name)
+                    or (since is not None and alert['timestamp'] < since)):
+                continue
+            if len(page) == limit:
+                return page, last_position
+            page.append(alert)
+            last_position = position
+        return page, None
+
+    def _scan_alerts(self, severity=None, alert_type=None):
+        # Filter the tiered list, skipping segments that hold no matches
+        return [alert for _, alert in self.alerts.iter_from(skip_segment=_segment_filter(severity, alert_type))
+                if (severity is None or alert.get('severity') == severity)
+                and (alert_type is None or alert.get('type') == alert_type)]
+
+    def get_recent_alerts(self):
+        """
+        The alerts held in memory - all of them, or the RAM tier with a memory budget
+        Returns: List of alerts
+        """
+        if isinstance(self.alerts, TieredAlertList):
+            return self.alerts.in_memory()
+        return self.alerts
+
+    def _all_alerts(self):
+        # Alerts kept in memory, or streamed back from the store
+        if self.keep_alerts:
+            return self.alerts
+        return self.store.iter_alerts()
 
     def export_json(self, filename='alerts.json'):
         """
-        Export all alerts to JSON file
+        Export all alerts to JSON file (streamed from the journal when there is one)
         """
         try:
+            if self.journal is not None:
+                self.journal.export_json(filename, self.get_summary())
+                print(f"[+] Alerts exported to {filename}")
+                return True
+
+            summary = self.get_summary()
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump({
-                    'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'total_alerts': len(self.alerts),
-                    'summary': self.get_summary(),
-                    'alerts': self.alerts
+                    'generated_at': format_timestamp(now()),
+                    'total_alerts': summary['total_alerts'],
+                    'summary': summary,
+                    'alerts': [serialize_alert(alert) for alert in self._all_alerts()]
                 }, f, indent=4, ensure_ascii=False)
 
             print(f"[+] Alerts exported to {filename}")
@@ -136,13 +314,13 @@ class AlertManager:
         try:
             import csv
 
-            if not self.alerts:
+            if not self.type_counts:
                 print("[!] No alerts to export")
                 return False
 
             # Get all unique keys from alerts
             fieldnames = set()
-            for alert in self.alerts:
+            for alert in self._all_alerts():
                 fieldnames.update(alert.keys())
 
             fieldnames = sorted(list(fieldnames))
@@ -150,7 +328,7 @@ class AlertManager:
             with open(filename, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
-                writer.writerows(self.alerts)
+                writer.writerows(serialize_alert(alert) for alert in self._all_alerts())
 
             print(f"[+] Alerts exported to {filename}")
             return True
@@ -163,11 +341,15 @@ class AlertManager:
         Print formatted summary to console
         """
         summary = self.get_summary()
+        # Let queued alerts print first
+        (self.console or get_console()).flush()
 
         print("\n" + "=" * 60)
         print("📊 ALERT SUMMARY")
         print("=" * 60)
         print(f"\nTotal Alerts: {summary['total_alerts']}")
+        if summary['suppressed']:
+            print(f"Suppressed Repeats: {summary['suppressed']}")
 
         if summary['total_alerts'] > 0:
             print("\nBy Severity:")
@@ -182,20 +364,98 @@ class AlertManager:
 
         print("=" * 60 + "\n")
 
+    def close(self):
+        """
+        Release a replaced manager - removes spilled alert segments and closes the journal
+        """
+        if isinstance(self.alerts, TieredAlertList):
+            self.alerts.close()
+        if self.journal:
+            self.journal.close()
+
     def clear_alerts(self):
         """
-        Clear all alerts (useful for testing)
+        Clear all alerts (useful for testing) - a store keeps its alerts
         """
-        self.alerts = []
+        if isinstance(self.alerts, TieredAlertList):
+            self.alerts.close()
+        self.alerts = self._new_alert_list()
         self.severity_counts = {
             'CRITICAL': 0,
             'HIGH': 0,
             'MEDIUM': 0,
             'LOW': 0
         }
+        self.type_counts = {}
+        self.alerts_by_severity = {}
+        self.alerts_by_type = {}
+        self.fingerprints.clear()
+        self.suppressed = 0
+        self.suppressed_by_type = {}
         print("[*] All alerts cleared")
 
 
+def _segment_filter(severity=None, alert_type=None, since=None):
+    """
+    Segment skip test for TieredAlertList.iter_from() - True when a spilled
+    segment can't hold an alert matching the filters
+    """
+    if severity is None and alert_type is None and since is None:
+        return None
+
+    def skip(segment):
+        return ((severity is not None and not segment['severity'][severity])
+                or (alert_type is not None and not segment['type'][alert_type])
+                or (since is not None and segment['last_timestamp'] is not None
+                    and segment['last_timestamp'] < since))
+    return skip
+
+
+def benchmark_status(sizes=(1000, 10000, 100000, 1000000), queries=200):
+    """
+    Time the dashboard status payload (get_summary() + JSON) as alerts grow,
+    against rebuilding the type counts by scanning every alert
+    Returns: List of per-size dictionaries with microseconds per query
+    """
+    import time
+
+    types = ['Suspicious Process Path', 'High-Risk Process Detected',
+             'Suspicious Parent-Child Relationship', 'Suspicious Service Configuration']
+    severities = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+    alert_mgr = AlertManager(print_alerts=False)
+    results = []
+
+    for size in sorted(sizes):
+        start = time.perf_counter()
+        for i in range(len(alert_mgr.alerts), size):
+            alert_mgr.add_alert({'severity': severities[i % 4], 'type': types[i % 4], 'pid': i,
+                                 'process_name': f'proc{i}.exe', 'description': 'Benchmark alert'})
+        add_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(queries):
+            json.dumps(alert_mgr.get_summary())
+        status_us = (time.perf_counter() - start) / queries * 1e6
+
+        # The old get_summary() - a full pass over the alerts per call
+        scan_queries = max(1, queries * 1000 // size)
+        start = time.perf_counter()
+        for _ in range(scan_queries):
+            by_type = {}
+            for alert in alert_mgr.alerts:
+                alert_type = alert.get('type', 'Unknown')
+                by_type[alert_type] = by_type.get(alert_type, 0) + 1
+        scan_us = (time.perf_counter() - start) / scan_queries * 1e6
+
+        start = time.perf_counter()
+        critical = alert_mgr.get_alerts_by_severity('CRITICAL')
+        filter_us = (time.perf_counter() - start) * 1e6
+
+        results.append({'alerts': size, 'status_us': status_us, 'scan_us': scan_us,
+                        'filter_us': filter_us, 'filter_results': len(critical), 'add_seconds': add_seconds})
+    return results
+
+
 # Test function - Only runs when file is executed directly
 if __name__ == "__main__":
     print("\n" + "=" * 60)
@@ -246,6 +506,13 @@ if __name__ == "__main__":
     for alert in test_alerts:
         alert_mgr.add_alert(alert)
 
+    # A rescan finds the same service again - folded into the first alert
+    for _ in range(3):
+        alert_mgr.add_alert(dict(test_alerts[-1], timestamp=now()))
+    get_console().flush()
+    print(f"🔁 Rescans: {alert_mgr.alerts[-1]['occurrences']} occurrences, "
+          f"{alert_mgr.suppressed} suppressed repeats\n")
+
     # Print summary
     alert_mgr.print_summary()
 
@@ -259,4 +526,10 @@ if __name__ == "__main__":
     high_alerts = alert_mgr.get_alerts_by_severity('HIGH')
     print(f"🟡 High Alerts: {len(high_alerts)}")
 
+    print("\n⏱️ STATUS QUERY COST AS ALERTS GROW (printing disabled):")
+    for result in benchmark_status():
+        print(f"   {result['alerts']:>9,} alerts: status {result['status_us']:7.1f} µs "
+              f"(full rescan {result['scan_us'] / 1000:8.2f} ms), "
+              f"CRITICAL filter {result['filter_us'] / 1000:6.2f} ms for {result['filter_results']:,} alerts")
+
     print("\n✅ Alert System Test Complete!\n")
\ No newline at end of file
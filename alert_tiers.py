@@ -0,0 +1,291 @@
+"""
+alert_tiers.py
+Tiered Alert List - The most recent alerts in RAM, older ones spilled to compressed segment files
+Keeps AlertManager's memory flat in long-running modes while iteration and queries still see every alert
+"""
+
+import os
+import gzip
+import json
+import bisect
+import tempfile
+import threading
+from collections import Counter
+from collections.abc import Sequence
+
+
+# Alerts kept in RAM by default in long-running modes
+DEFAULT_MEMORY_ALERTS = 20000
+
+# Alerts per spilled segment file
+SEGMENT_SIZE = 5000
+
+
+class TieredAlertList(Sequence):
+    """
+    Append-only alert sequence with a bounded RAM tier
+
+    When the RAM tier reaches capacity, its oldest segment_size alerts are
+    written to a gzip JSON Lines segment file and dropped from memory. Each
+    segment keeps only small metadata (position, per-severity/per-type counts,
+    time range), which lets filtered scans skip segments without reading them.
+    Indexing, slicing and iteration span both tiers in insertion order; the
+    last segment read is cached, so sequential access decompresses each
+    segment once.
+
+    Spilled alerts are read back as copies, so changes to them go through
+    update(): fields changed after an alert was spilled (e.g. dedup occurrence
+    counts) are kept in its segment's side table and applied on every read.
+    spill_dir: Directory to create the list's segment directory in, or None for
+               the system temp directory - either way it is removed with the list
+    """
+
+    def __init__(self, capacity=DEFAULT_MEMORY_ALERTS, spill_dir=None, segment_size=SEGMENT_SIZE):
+        self.capacity = max(2, capacity)
+        self.segment_size = max(1, min(segment_size, self.capacity // 2))
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+        self._tempdir = tempfile.TemporaryDirectory(prefix='alert_segments_', dir=spill_dir)
+        self.directory = self._tempdir.name
+        self.ram = []
+        self.segments = []  # Segment metadata, oldest first
+        self.segment_starts = []
+        self.spilled = 0  # Position of ram[0]
+        self.spilled_bytes = 0
+        self.lock = threading.RLock()
+        self._cached = (None, None)  # (segment number, alerts)
+
+    def __len__(self):
+        return self.spilled + len(self.ram)
+
+    def append(self, alert):
+        """
+        Add an alert to the RAM tier, spilling the oldest segment when full
+        """
+        with self.lock:
+            self.ram.append(alert)
+            if len(self.ram) >= self.capacity:
+                self._spill()
+
+    def _spill(self):
+        chunk = self.ram[:self.segment_size]
+        number = len(self.segments)
+        path = os.path.join(self.directory, f'segment_{number:06d}.jsonl.gz')
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            for alert in chunk:
+                f.write(json.dumps(alert, default=str, ensure_ascii=False))
+                f.write('\n')
+
+        timestamps = [alert['timestamp'] for alert in chunk if isinstance(alert.get('timestamp'), (int, float))]
+        self.segments.append({
+            'path': path,
+            'start': self.spilled,
+            'count': len(chunk),
+            'severity': Counter(alert.get('severity') for alert in chunk),
+            'type': Counter(alert.get('type') for alert in chunk),
+            'first_timestamp': min(timestamps) if timestamps else None,
+            'last_timestamp': max(timestamps) if timestamps else None,
+            'updates': {}  # index in segment -> fields changed since the spill
+        })
+        self.segment_starts.append(self.spilled)
+        self.spilled += len(chunk)
+        self.spilled_bytes += os.path.getsize(path)
+        del self.ram[:len(chunk)]
+
+    def _load_segment(self, number):
+        with self.lock:  # Updates must not land between the read and the cache fill
+            cached_number, alerts = self._cached
+            if cached_number != number:
+                with gzip.open(self.segments[number]['path'], 'rt', encoding='utf-8') as f:
+                    alerts = [json.loads(line) for line in f]
+                for index, fields in self.segments[number]['updates'].items():
+                    alerts[index].update(fields)
+                self._cached = (number, alerts)
+            return alerts
+
+    def _segment_entries(self, number, match_text=None):
+        """
+        (index in segment, alert) pairs of a segment - with match_text, only lines
+        containing every given fragment are decoded
+        """
+        if not match_text:
+            return list(enumerate(self._load_segment(number)))
+        with gzip.open(self.segments[number]['path'], 'rt', encoding='utf-8') as f:
+            entries = [(index, json.loads(line)) for index, line in enumerate(f)
+                       if all(text in line for text in match_text)]
+        with self.lock:
+            updates = dict(self.segments[number]['updates'])
+        for index, alert in entries:
+            if index in updates:
+                alert.update(updates[index])
+        return entries
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        with self.lock:
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError('alert index out of range')
+            if index >= self.spilled:
+                return self.ram[index - self.spilled]
+            number = bisect.bisect_right(self.segment_starts, index) - 1
+            return self._load_segment(number)[index - self.segments[number]['start']]
+
+    def __iter__(self):
+        for _, alert in self.iter_from():
+            yield alert
+
+    def update(self, position, fields):
+        """
+        Change fields of the alert at position - in place in RAM, or in the
+        segment's side table once it has been spilled
+        """
+        with self.lock:
+            if position >= self.spilled:
+                self.ram[position - self.spilled].update(fields)
+                return
+            number = bisect.bisect_right(self.segment_starts, position) - 1
+            index = position - self.segments[number]['start']
+            self.segments[number]['updates'].setdefault(index, {}).update(fields)
+            cached_number, alerts = self._cached
+            if cached_number == number:
+                alerts[index].update(fields)
+
+    def iter_from(self, cursor=None, reverse=False, skip_segment=None, match_text=None):
+        """
+        Alerts after (or, reversed, before) position cursor
+        skip_segment: Called with a segment's metadata - True skips the whole segment unread
+        match_text: Spilled alerts whose JSON line lacks any of these fragments are skipped
+                    without decoding (a prefilter - callers still check each alert)
+        Returns: Iterator of (position, alert)
+        """
+        with self.lock:
+            segments = list(self.segments)
+            spilled = self.spilled
+            ram = list(self.ram)
+
+        if not reverse:
+            start = 0 if cursor is None else cursor + 1
+            for number, segment in enumerate(segments):
+                end = segment['start'] + segment['count']
+                if end <= start or (skip_segment and skip_segment(segment)):
+                    continue
+                for index, alert in self._segment_entries(number, match_text):
+                    if segment['start'] + index >= start:
+                        yield segment['start'] + index, alert
+            for position in range(max(start, spilled), spilled + len(ram)):
+                yield position, ram[position - spilled]
+        else:
+            stop = spilled + len(ram) if cursor is None else cursor
+            for position in range(min(stop, spilled + len(ram)) - 1, spilled - 1, -1):
+                yield position, ram[position - spilled]
+            for number in range(len(segments) - 1, -1, -1):
+                segment = segments[number]
+                if segment['start'] >= stop or (skip_segment and skip_segment(segment)):
+                    continue
+                for index, alert in reversed(self._segment_entries(number, match_text)):
+                    if segment['start'] + index < stop:
+                        yield segment['start'] + index, alert
+
+    def in_memory(self):
+        """
+        The alerts currently in the RAM tier (the most recent ones)
+        Returns: List of alerts
+        """
+        with self.lock:
+            return list(self.ram)
+
+    def close(self):
+        """
+        Drop all alerts and remove the list's segment directory
+        """
+        with self.lock:
+            self.ram = []
+            self.segments = []
+            self.segment_starts = []
+            self.spilled = 0
+            self.spilled_bytes = 0
+            self._cached = (None, None)
+            self._tempdir.cleanup()
+
+    def get_stats(self):
+        """
+        Tier sizes
+        Returns: Dictionary of stats
+        """
+        return {
+            'in_memory': len(self.ram),
+            'capacity': self.capacity,
+            'spilled': self.spilled,
+            'segments': len(self.segments),
+            'spilled_bytes': self.spilled_bytes,
+            'directory': self.directory
+        }
+
+
+def benchmark_retention(count=2000000, days=7, capacity=DEFAULT_MEMORY_ALERTS, checkpoints=10):
+    """
+    Feed a week's worth of alerts (timestamps spread over days) through an
+    AlertManager with a memory budget, sampling RSS as alerts accumulate
+    Returns: Dictionary with RSS samples in MB and tier stats
+    """
+    import time
+    import psutil
+    from alert_sys import AlertManager
+
+    process = psutil.Process()
+    alert_mgr = AlertManager(print_alerts=False, memory_budget=capacity)
+    base = time.time()
+    step = days * 86400 / count
+    samples = []
+
+    start = time.perf_counter()
+    for i in range(count):
+        alert_mgr.add_alert({'severity': 'MEDIUM', 'type': 'Suspicious Process Path', 'pid': i % 65536,
+                             'process_name': f'tool{i}.exe', 'path': f'C:\\Users\\Public\\tool{i}.exe',
+                             'timestamp': base + i * step, 'description': 'Process running from suspicious location'})
+        if (i + 1) % (count // checkpoints) == 0:
+            samples.append((i + 1, process.memory_info().rss / 1e6))
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    page, _ = alert_mgr.query_alerts(process_name='tool10.exe')
+    oldest_lookup = time.perf_counter() - start
+    stats = alert_mgr.alerts.get_stats()
+    alert_mgr.alerts.close()
+
+    return {'alerts': count, 'rss_mb': samples, 'seconds': elapsed, 'tiers': stats,
+            'oldest_lookup_seconds': oldest_lookup, 'oldest_found': len(page)}
+
+
+# Test function - Only runs when file is executed directly
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("🧊 TIERED ALERT LIST - TEST MODE")
+    print("=" * 60 + "\n")
+
+    tiers = TieredAlertList(capacity=10, segment_size=4)
+    for pid in range(25):
+        tiers.append({'severity': 'HIGH' if pid % 5 == 0 else 'LOW', 'type': 'Test Alert', 'pid': pid})
+    stats = tiers.get_stats()
+    print(f"   {len(tiers)} alerts: {stats['in_memory']} in RAM, {stats['spilled']} in {stats['segments']} segments")
+    print(f"   alerts[3]: pid {tiers[3]['pid']}, alerts[-1]: pid {tiers[-1]['pid']}")
+    print(f"   All pids in order: {[alert['pid'] for alert in tiers] == list(range(25))}")
+    high = [alert['pid'] for _, alert in tiers.iter_from(skip_segment=lambda segment: not segment['severity']['HIGH'])
+            if alert['severity'] == 'HIGH']
+    print(f"   HIGH alerts (segments without HIGH skipped): {high}")
+    tiers.update(2, {'occurrences': 3})
+    print(f"   Update after spill: alerts[2] occurrences = {tiers[2].get('occurrences')}")
+    tiers.close()
+
+    result = benchmark_retention()
+    print(f"\n⏱️ {result['alerts']:,} ALERTS OVER 7 DAYS, {result['tiers']['capacity']:,} IN RAM:")
+    for alerts, rss in result['rss_mb']:
+        print(f"   after {alerts:>9,} alerts: RSS {rss:6.1f} MB")
+    print(f"   {result['tiers']['segments']} segments, {result['tiers']['spilled_bytes'] / 1e6:.1f} MB on disk, "
+          f"{result['alerts'] / result['seconds']:,.0f} alerts/s")
+    print(f"   Query for the oldest alert: {result['oldest_lookup_seconds']:.2f} s (found {result['oldest_found']})")
+
+    print("\n✅ Tiered Alert List Test Complete!\n")
@@ -4,39 +4,223 @@ Process Monitoring Module - Enumerates and analyzes Windows processes
 """
 
 import psutil
-from datetime import datetime
+from bisect import bisect_left, insort
 
+from process_table import ProcessTable
+from time_utils import now, format_timestamp
+from procfs_enum import get_all_processes_procfs, iter_procfs_processes
 
-def get_all_processes():
+
+# Available enumeration backends for get_all_processes()
+PROCESS_BACKENDS = ('psutil', 'procfs')
+
+
+def iter_processes(backend='psutil', fields=None):
     """
-    Enumerate all running processes on the system
-    Returns: List of dictionaries containing process information
+    Stream running processes one record at a time
+    Lets detections start on the first process instead of waiting for the full scan
+    backend/fields: Same as get_all_processes()
+    Yields: Process dictionaries in get_all_processes() format
     """
-    processes = []
+    if backend == 'procfs':
+        yield from iter_procfs_processes(fields)
+        return
+    if backend != 'psutil':
+        raise ValueError(f"Unknown process backend: {backend} (expected one of {PROCESS_BACKENDS})")
 
-    print("[*] Scanning running processes...")
+    # One timestamp for the whole scan instead of one per process
+    scan_time = now()
 
     for proc in psutil.process_iter(['pid', 'name', 'ppid', 'exe', 'username', 'create_time']):
         try:
-            proc_info = {
-                'pid': proc.info['pid'],
-                'name': proc.info['name'],
-                'ppid': proc.info['ppid'],  # Parent Process ID
-                'path': proc.info['exe'],
-                'user': proc.info['username'],
-                'create_time': datetime.fromtimestamp(proc.info['create_time']).strftime('%Y-%m-%d %H:%M:%S'),
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            processes.append(proc_info)
+            yield _build_process_record(proc.info, scan_time)
 
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             # Some system processes can't be accessed - skip them
             continue
 
+
+def get_all_processes(backend='psutil', fields=None):
+    """
+    Enumerate all running processes on the system
+    backend: 'psutil' (default, cross-platform) or 'procfs' (Linux /proc fast path)
+    fields: Optional list of record fields to collect - only used by the procfs backend,
+            fields not requested are returned as None
+    Returns: List of dictionaries containing process information
+    """
+    if backend == 'procfs':
+        return get_all_processes_procfs(fields)
+    if backend != 'psutil':
+        raise ValueError(f"Unknown process backend: {backend} (expected one of {PROCESS_BACKENDS})")
+
+    print("[*] Scanning running processes...")
+
+    processes = list(iter_processes(backend))
+
     print(f"[+] Found {len(processes)} processes")
     return processes
 
 
+def get_process_table():
+    """
+    Enumerate all running processes into a columnar ProcessTable
+    Uses far less memory per process than get_all_processes() for large snapshots
+    Returns: ProcessTable (iterates as dict-like process rows)
+    """
+    table = ProcessTable()
+
+    print("[*] Scanning running processes...")
+
+    for proc in psutil.process_iter(['pid', 'name', 'ppid', 'exe', 'username', 'create_time']):
+        info = proc.info
+        table.add(info['pid'], info['name'], info['ppid'], info['exe'], info['username'], info['create_time'])
+
+    print(f"[+] Found {len(table)} processes")
+    return table
+
+
+def _build_process_record(info, scan_time):
+    """
+    Convert raw psutil process attributes into our process record format
+    Times are epoch floats - use time_utils.format_timestamp() when displaying them
+    """
+    return {
+        'pid': info['pid'],
+        'name': info['name'],
+        'ppid': info['ppid'],  # Parent Process ID
+        'path': info['exe'],
+        'user': info['username'],
+        'create_time': info['create_time'],
+        'timestamp': scan_time
+    }
+
+
+class IncrementalScanner:
+    """
+    Incremental process snapshot engine
+
+    Keeps the previous snapshot keyed by (pid, create_time) so that the expensive
+    attributes (exe, username, ppid) are only fetched for processes we have not
+    seen before. A PID that was reused by a new process gets a new identity.
+    """
+
+    DETAIL_ATTRS = ['pid', 'name', 'ppid', 'exe', 'username', 'create_time']
+
+    def __init__(self):
+        self.snapshot = {}  # (pid, create_time) -> process record
+        self.last_scan_stats = {
+            'total': 0,
+            'started': 0,
+            'exited': 0,
+            'unchanged': 0,
+            'detail_fetches': 0
+        }
+
+    def scan(self):
+        """
+        Take a new snapshot and diff it against the previous one
+        Returns: Dictionary with 'started', 'exited' and 'unchanged' process lists
+        """
+        previous = self.snapshot
+        current = {}
+        scan_time = now()
+        started = []
+        unchanged = []
+        detail_fetches = 0
+
+        # Only pid and create_time are needed to identify a process
+        for proc in psutil.process_iter(['create_time']):
+            key = (proc.pid, proc.info['create_time'])
+
+            record = previous.get(key)
+            if record is not None:
+                current[key] = record
+                unchanged.append(record)
+                continue
+
+            try:
+                detail_fetches += 1
+                with proc.oneshot():
+                    info = proc.as_dict(self.DETAIL_ATTRS)
+                info['create_time'] = key[1]
+                record = _build_process_record(info, scan_time)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                # Process exited while we were reading it
+                continue
+
+            current[key] = record
+            started.append(record)
+
+        exited = [record for key, record in previous.items() if key not in current]
+
+        self.snapshot = current
+        self.last_scan_stats = {
+            'total': len(current),
+            'started': len(started),
+            'exited': len(exited),
+            'unchanged': len(unchanged),
+            'detail_fetches': detail_fetches
+        }
+
+        return {
+            'started': started,
+            'exited': exited,
+            'unchanged': unchanged
+        }
+
+    def get_processes(self):
+        """
+        Get the current snapshot in the same format as get_all_processes()
+        Returns: List of process dictionaries
+        """
+        return list(self.snapshot.values())
+
+    def reset(self):
+        """
+        Forget the previous snapshot so the next scan is a full scan
+        """
+        self.snapshot = {}
+
+
+def diff_snapshots(previous, processes):
+    """
+    Diff a full process list against the previous snapshot
+    Works with any process source (IncrementalScanner only diffs the live system).
+    A process whose name or path changed under the same (pid, create_time) -
+    e.g. after an exec - is reported as 'changed'.
+
+    previous: Dictionary mapping (pid, create_time) to process record, from the last call
+    Returns: (delta dictionary with 'started', 'exited', 'changed' and 'unchanged'
+              lists, new snapshot dictionary to pass in next time)
+    """
+    current = {}
+    started = []
+    changed = []
+    unchanged = []
+
+    for proc in processes:
+        key = (proc['pid'], proc['create_time'])
+        current[key] = proc
+
+        old = previous.get(key)
+        if old is None:
+            started.append(proc)
+        elif old is not proc and (old['name'] != proc['name'] or old['path'] != proc['path']):
+            changed.append(proc)
+        else:
+            unchanged.append(proc)
+
+    exited = [proc for key, proc in previous.items() if key not in current]
+
+    delta = {
+        'started': started,
+        'exited': exited,
+        'changed': changed,
+        'unchanged': unchanged
+    }
+    return delta, current
+
+
 def build_process_tree(processes):
     """
     Build parent-child relationship tree from process list
@@ -64,11 +248,344 @@ def build_process_tree(processes):
     return process_tree, pid_to_process
 
 
-def get_process_by_name(processes, name):
+class ProcessTreeIndex:
+    """
+    Ancestry index over a process snapshot, built once per snapshot
+
+    Processes are numbered in DFS pre-order, so every subtree is a contiguous
+    slice of that order and "is A an ancestor of B" is two integer comparisons.
+    Ancestor chains are memoized as they are requested.
+
+    PID reuse is handled safely: a process whose recorded parent is younger
+    than itself (the parent PID was reused) or that sits on a ppid cycle is
+    treated as a root instead of being attached to the wrong parent.
+    """
+
+    def __init__(self, processes):
+        self.pid_to_process = {proc['pid']: proc for proc in processes}
+        self.parent = {}            # pid -> parent pid (None for roots)
+        self.children = {}          # pid -> list of child pids
+        self.roots = []
+        self.reused_parents = []    # (pid, ppid) edges dropped because the ppid was reused
+        self.broken_cycles = []     # (pid, ppid) edges dropped to break ppid cycles
+        self.order = []             # pids in DFS pre-order
+        self.enter = {}             # pid -> position in self.order
+        self.exit = {}              # pid -> end of the subtree slice in self.order
+        self._ancestor_cache = {}
+
+        self._link_parents()
+        self._number_nodes()
+
+    def _link_parents(self):
+        """
+        Resolve each process' parent, dropping edges that can't be real
+        """
+        pid_to_process = self.pid_to_process
+
+        for pid, proc in pid_to_process.items():
+            ppid = proc['ppid']
+            parent = pid_to_process.get(ppid)
+
+            if parent is None or ppid == pid:
+                self.parent[pid] = None
+                continue
+
+            # A parent can't be created after its child - the ppid now belongs to another process
+            parent_created = parent['create_time']
+            child_created = proc['create_time']
+            if parent_created and child_created and parent_created > child_created:
+                self.reused_parents.append((pid, ppid))
+                self.parent[pid] = None
+                continue
+
+            self.parent[pid] = ppid
+            self.children.setdefault(ppid, []).append(pid)
+
+        self.roots = [pid for pid, ppid in self.parent.items() if ppid is None]
+
+    def _number_nodes(self):
+        """
+        Assign pre-order numbers with an iterative DFS (trees can be very deep)
+        Anything not reached from a root is on a ppid cycle - break it and continue
+        """
+        for root in self.roots:
+            self._walk(root)
+
+        if len(self.order) < len(self.pid_to_process):
+            for pid in list(self.pid_to_process):
+                if pid not in self.enter:
+                    root = self._break_cycle(pid)
+                    self._walk(root)
+
+    def _walk(self, root):
+        order = self.order
+        enter = self.enter
+        exit_ = self.exit
+        children = self.children
+
+        stack = [(root, False)]
+        while stack:
+            pid, done = stack.pop()
+            if done:
+                exit_[pid] = len(order)
+                continue
+
+            enter[pid] = len(order)
+            order.append(pid)
+            stack.append((pid, True))
+            for child in reversed(children.get(pid, ())):
+                stack.append((child, False))
+
+    def _break_cycle(self, pid):
+        """
+        Follow parent links from pid until the cycle closes, then cut the edge
+        into the oldest process on the cycle, which becomes a new root
+        """
+        seen = []
+        position = {}
+        while pid not in position:
+            position[pid] = len(seen)
+            seen.append(pid)
+            pid = self.parent[pid]
+        cycle = seen[position[pid]:]
+
+        new_root = min(cycle, key=lambda p: self.pid_to_process[p]['create_time'] or 0)
+        old_parent = self.parent[new_root]
+        self.children[old_parent].remove(new_root)
+        self.parent[new_root] = None
+        self.roots.append(new_root)
+        self.broken_cycles.append((new_root, old_parent))
+        return new_root
+
+    def __contains__(self, pid):
+        return pid in self.enter
+
+    def parent_of(self, pid):
+        """
+        Get the verified parent PID of a process (None for roots)
+        """
+        return self.parent.get(pid)
+
+    def is_ancestor(self, ancestor_pid, pid):
+        """
+        Check if ancestor_pid is a (strict) ancestor of pid - O(1)
+        """
+        start = self.enter.get(ancestor_pid)
+        position = self.enter.get(pid)
+        if start is None or position is None:
+            return False
+        return start < position < self.exit[ancestor_pid]
+
+    def subtree(self, pid, include_self=True):
+        """
+        Get all processes in the subtree of pid as a contiguous slice of the pre-order
+        Returns: List of process records (the process itself first)
+        """
+        start = self.enter.get(pid)
+        if start is None:
+            return []
+        if not include_self:
+            start += 1
+        return [self.pid_to_process[p] for p in self.order[start:self.exit[pid]]]
+
+    def descendant_count(self, pid):
+        """
+        Number of processes below pid - O(1)
+        """
+        if pid not in self.enter:
+            return 0
+        return self.exit[pid] - self.enter[pid] - 1
+
+    def ancestors(self, pid):
+        """
+        Get the chain of ancestor PIDs, nearest parent first (memoized)
+        Returns: Tuple of PIDs
+        """
+        cache = self._ancestor_cache
+        if pid in cache:
+            return cache[pid]
+
+        # Walk up until we hit a root or a cached chain, then fill the cache on the way down
+        path = []
+        node = pid
+        while node is not None and node not in cache:
+            path.append(node)
+            node = self.parent.get(node)
+
+        chain = cache[node] if node is not None else ()
+        for node_pid in reversed(path):
+            parent = self.parent.get(node_pid)
+            chain = (parent,) + chain if parent is not None else ()
+            cache[node_pid] = chain
+
+        return cache[pid]
+
+    def ancestor_names(self, pid):
+        """
+        Get the names of the ancestor chain, nearest parent first
+        """
+        return [self.pid_to_process[p]['name'] for p in self.ancestors(pid)]
+
+
+def build_tree_index(processes):
+    """
+    Build the ancestry index for a process snapshot
+    Returns: ProcessTreeIndex
+    """
+    print("[*] Building process ancestry index...")
+    index = ProcessTreeIndex(processes)
+    print(f"[+] Ancestry index built: {len(index.roots)} roots, "
+          f"{len(index.reused_parents)} reused parent PIDs, {len(index.broken_cycles)} cycles broken")
+    return index
+
+
+class ProcessIndex:
+    """
+    Hash indexes over a process snapshot for O(1) lookups
+
+    casefolded name -> pids, casefolded exe path -> pids, user -> pids,
+    plus a sorted array of names so prefix queries are O(log n) via bisect.
+    Kept up to date incrementally with apply_delta() (IncrementalScanner deltas).
+    """
+
+    def __init__(self, processes=()):
+        self.records = {}       # pid -> process record
+        self.by_name = {}       # casefolded name -> set of pids
+        self.by_path = {}       # casefolded path -> set of pids
+        self.by_user = {}       # user -> set of pids
+        self.name_keys = []     # sorted casefolded names (keys of by_name)
+
+        for proc in processes:
+            self.add(proc)
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, proc):
+        """
+        Add a process to the indexes (replaces any older process with the same PID)
+        """
+        pid = proc['pid']
+        old = self.records.get(pid)
+        if old is not None:
+            self.remove(old)
+
+        self.records[pid] = proc
+
+        name_key = _fold(proc['name'])
+        pids = self.by_name.get(name_key)
+        if pids is None:
+            pids = self.by_name[name_key] = set()
+            insort(self.name_keys, name_key)
+        pids.add(pid)
+
+        if proc['path']:
+            self.by_path.setdefault(_fold(proc['path']), set()).add(pid)
+        if proc['user']:
+            self.by_user.setdefault(proc['user'], set()).add(pid)
+
+    def remove(self, proc):
+        """
+        Remove a process from the indexes
+        Ignored if the PID now belongs to a different process
+        """
+        pid = proc['pid']
+        current = self.records.get(pid)
+        if current is None or current['create_time'] != proc['create_time']:
+            return
+
+        del self.records[pid]
+
+        name_key = _fold(current['name'])
+        if _discard(self.by_name, name_key, pid):
+            position = bisect_left(self.name_keys, name_key)
+            del self.name_keys[position]
+
+        if current['path']:
+            _discard(self.by_path, _fold(current['path']), pid)
+        if current['user']:
+            _discard(self.by_user, current['user'], pid)
+
+    def apply_delta(self, delta):
+        """
+        Update the indexes from an IncrementalScanner.scan() delta
+        Exits are applied first so reused PIDs end up pointing at the new process
+        """
+        for proc in delta['exited']:
+            self.remove(proc)
+        for proc in delta.get('changed', ()):
+            previous = self.records.get(proc['pid'])
+            if previous is not None:
+                self.remove(previous)
+            self.add(proc)
+        for proc in delta['started']:
+            self.add(proc)
+
+    def _lookup(self, index, key):
+        return [self.records[pid] for pid in index.get(key, ())]
+
+    def find_by_name(self, name):
+        """
+        Find processes by exact name (case-insensitive)
+        """
+        return self._lookup(self.by_name, _fold(name))
+
+    def find_by_path(self, path):
+        """
+        Find processes by exact executable path (case-insensitive)
+        """
+        return self._lookup(self.by_path, _fold(path))
+
+    def find_by_user(self, user):
+        """
+        Find processes owned by a user
+        """
+        return self._lookup(self.by_user, user)
+
+    def find_by_name_prefix(self, prefix):
+        """
+        Find processes whose name starts with prefix (case-insensitive)
+        """
+        prefix = _fold(prefix)
+        keys = self.name_keys
+        results = []
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            results.extend(self._lookup(self.by_name, keys[position]))
+            position += 1
+        return results
+
+
+def _fold(value):
+    """
+    Normalize a name or path for case-insensitive lookups
+    """
+    return value.casefold() if value else ''
+
+
+def _discard(index, key, pid):
+    """
+    Remove pid from index[key], dropping the key when it becomes empty
+    Returns: True if the key was dropped
+    """
+    pids = index.get(key)
+    if pids is None:
+        return False
+    pids.discard(pid)
+    if not pids:
+        del index[key]
+        return True
+    return False
+
+
+def get_process_by_name(processes, name, index=None):
     """
     Find all processes matching a specific name
+    index: Optional ProcessIndex for an O(1) lookup instead of a linear scan
     Returns: List of matching processes
     """
+    if index is not None:
+        return index.find_by_name(name)
     return [proc for proc in processes if proc['name'].lower() == name.lower()]
 
 
@@ -90,7 +607,7 @@ def display_process_info(process):
     print(f"Parent PID: {process['ppid']}")
     print(f"Path: {process['path']}")
     print(f"User: {process['user']}")
-    print(f"Created: {process['create_time']}")
+    print(f"Created: {format_timestamp(process['create_time'])}")
     print("=" * 60)
 
 
@@ -121,4 +638,14 @@ if __name__ == "__main__":
     if chrome_procs:
         print(f"\n🌐 Found {len(chrome_procs)} Chrome processes")
 
+    # Incremental scanning - second scan should only fetch details for new processes
+    scanner = IncrementalScanner()
+    scanner.scan()
+    print(f"\n🔁 Initial scan: {scanner.last_scan_stats['detail_fetches']} detail fetches")
+    delta = scanner.scan()
+    stats = scanner.last_scan_stats
+    print(f"🔁 Rescan: {stats['detail_fetches']} detail fetches, "
+          f"{len(delta['started'])} started, {len(delta['exited'])} exited, "
+          f"{len(delta['unchanged'])} unchanged")
+
     print("\n✅ Test Complete!\n")
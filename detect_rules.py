@@ -3,7 +3,11 @@ detecr_rules.py
 Detection Rules Engine - Defines suspicious behavior patterns
 """
 
-from datetime import datetime
+import time
+
+from time_utils import now
+from path_matcher import PathMatcher
+from rule_profiler import RuleProfiler, DetectionResults
 
 # ============================================================================
 # DETECTION RULES CONFIGURATION
@@ -22,6 +26,18 @@ SUSPICIOUS_PARENT_CHILD = {
     'msedge.exe': ['powershell.exe', 'wscript.exe', 'mshta.exe'],
 }
 
+# Rule 1b: Suspicious Multi-Level Process Chains
+# Ancestor -> ... -> process, each step a direct parent-child link
+SUSPICIOUS_PROCESS_CHAINS = [
+    ('winword.exe', 'cmd.exe', 'powershell.exe'),
+    ('excel.exe', 'cmd.exe', 'powershell.exe'),
+    ('outlook.exe', 'cmd.exe', 'powershell.exe'),
+    ('winword.exe', 'wscript.exe', 'powershell.exe'),
+    ('excel.exe', 'wscript.exe', 'powershell.exe'),
+    ('winword.exe', 'powershell.exe', 'cmd.exe'),
+    ('excel.exe', 'powershell.exe', 'cmd.exe'),
+]
+
 # Rule 2: Suspicious File Paths
 # Processes shouldn't run from these locations
 SUSPICIOUS_PATHS = [
@@ -75,87 +91,424 @@ LEGITIMATE_SERVICE_PATHS = [
 ]
 
 
+# Compiled matchers for the path rules - each path is scanned once for all patterns
+SUSPICIOUS_PATH_MATCHER = None
+SUSPICIOUS_SERVICE_PATH_MATCHER = None
+LEGITIMATE_SERVICE_PATH_MATCHER = None
+
+
+def compile_path_rules():
+    """
+    (Re)compile the path pattern lists into matchers
+    Call again after changing SUSPICIOUS_PATHS, SUSPICIOUS_SERVICE_PATHS or LEGITIMATE_SERVICE_PATHS
+    """
+    global SUSPICIOUS_PATH_MATCHER, SUSPICIOUS_SERVICE_PATH_MATCHER, LEGITIMATE_SERVICE_PATH_MATCHER
+    SUSPICIOUS_PATH_MATCHER = PathMatcher(SUSPICIOUS_PATHS)
+    SUSPICIOUS_SERVICE_PATH_MATCHER = PathMatcher(SUSPICIOUS_SERVICE_PATHS)
+    LEGITIMATE_SERVICE_PATH_MATCHER = PathMatcher(LEGITIMATE_SERVICE_PATHS)
+
+
+def compile_parent_child_rules():
+    """
+    (Re)compile SUSPICIOUS_PARENT_CHILD and SUSPICIOUS_PROCESS_CHAINS into reverse maps
+    keyed by the child (last) process name, so each process needs one probe on its
+    own name and, only on a hit, one on its parent's
+    Call again after changing either rule list
+    """
+    global CHILD_TO_PARENTS, PROCESS_CHAIN_INDEX
+
+    child_to_parents = {}
+    for parent, children in SUSPICIOUS_PARENT_CHILD.items():
+        for child in children:
+            child_to_parents.setdefault(child.lower(), set()).add(parent.lower())
+    CHILD_TO_PARENTS = {child: frozenset(parents) for child, parents in child_to_parents.items()}
+
+    # Last name -> list of ancestor-name tuples, nearest ancestor first
+    chain_index = {}
+    for chain in SUSPICIOUS_PROCESS_CHAINS:
+        names = tuple(name.lower() for name in chain)
+        chain_index.setdefault(names[-1], []).append(names[-2::-1])
+    PROCESS_CHAIN_INDEX = chain_index
+
+
+CHILD_TO_PARENTS = {}
+PROCESS_CHAIN_INDEX = {}
+
+compile_path_rules()
+compile_parent_child_rules()
+
+
 # ============================================================================
 # DETECTION FUNCTIONS
 # ============================================================================
 
-def detect_suspicious_parent_child(process_tree, pid_to_process):
+def check_parent_child(parent_proc, child, timestamp=None):
+    """
+    Check a single parent -> child edge against the suspicious parent-child rules
+    timestamp: Epoch to stamp the alert with (pass the scan time to avoid a clock read per alert)
+    Returns: Alert dictionary, or None if the edge is benign
+    """
+    forbidden_parents = CHILD_TO_PARENTS.get(child['name'].lower())
+
+    # Check if this child may not be spawned by this parent
+    if forbidden_parents and parent_proc['name'].lower() in forbidden_parents:
+        return {
+            'severity': 'HIGH',
+            'type': 'Suspicious Parent-Child Relationship',
+            'parent_name': parent_proc['name'],
+            'parent_pid': parent_proc['pid'],
+            'child_name': child['name'],
+            'child_pid': child['pid'],
+            'child_path': child['path'],
+            'child_create_time': child.get('create_time'),
+            'description': f"{parent_proc['name']} spawned {child['name']} - Potential malware execution",
+            'timestamp': timestamp if timestamp is not None else now()
+        }
+    return None
+
+
+def check_process_chain(proc, pid_to_process, tree_index=None, timestamp=None):
+    """
+    Check if a process ends a suspicious multi-level chain (e.g. winword -> cmd -> powershell)
+    Ancestors are only looked up when the process name ends a chain; with a
+    core_mon.ProcessTreeIndex the memoized ancestor chain is used, otherwise the
+    parent links are walked (skipping reused parent PIDs)
+    Returns: Alert dictionary, or None
+    """
+    chains = PROCESS_CHAIN_INDEX.get(proc['name'].lower())
+    if not chains:
+        return None
+
+    depth = max(len(chain) for chain in chains)
+    if tree_index is not None and proc['pid'] in tree_index:
+        ancestors = [tree_index.pid_to_process[pid] for pid in tree_index.ancestors(proc['pid'])[:depth]]
+    else:
+        ancestors = []
+        node = proc
+        while len(ancestors) < depth:
+            parent = pid_to_process.get(node['ppid'])
+            if parent is None or parent is node or is_reused_parent(parent, node):
+                break
+            ancestors.append(parent)
+            node = parent
+
+    names = [ancestor['name'].lower() for ancestor in ancestors]
+    for chain in chains:
+        if tuple(names[:len(chain)]) == chain:
+            links = list(reversed(ancestors[:len(chain)])) + [proc]
+            chain_text = ' → '.join(link['name'] for link in links)
+            return {
+                'severity': 'CRITICAL',
+                'type': 'Suspicious Process Chain',
+                'process_name': proc['name'],
+                'pid': proc['pid'],
+                'path': proc['path'],
+                'chain': chain_text,
+                'chain_pids': [link['pid'] for link in links],
+                'create_time': proc.get('create_time'),
+                'description': f"Process chain {chain_text} - Potential malware execution",
+                'timestamp': timestamp if timestamp is not None else now()
+            }
+    return None
+
+
+def check_process_path(proc, timestamp=None):
+    """
+    Check if a single process runs from a suspicious/risky location
+    timestamp: Epoch to stamp the alert with
+    Returns: Alert dictionary, or None
+    """
+    if not proc['path']:
+        return None
+
+    # Skip legitimate system processes
+    if proc['name'] in LEGITIMATE_PROCESSES:
+        return None
+
+    # First matching suspicious path (in list order) - only alert once per process
+    sus_path = SUSPICIOUS_PATH_MATCHER.first_match(proc['path'])
+    if sus_path is not None:
+        return {
+            'severity': 'MEDIUM',
+            'type': 'Suspicious Process Path',
+            'process_name': proc['name'],
+            'pid': proc['pid'],
+            'path': proc['path'],
+            'create_time': proc.get('create_time'),
+            'description': f"Process running from risky location: {sus_path}",
+            'timestamp': timestamp if timestamp is not None else now()
+        }
+    return None
+
+
+def check_process_name(proc, timestamp=None):
+    """
+    Check if a single process has a known malicious or high-risk name
+    timestamp: Epoch to stamp the alert with
+    Returns: Alert dictionary, or None
+    """
+    if proc['name'].lower() in SUSPICIOUS_PROCESS_NAMES:
+        return {
+            'severity': 'CRITICAL',
+            'type': 'High-Risk Process Detected',
+            'process_name': proc['name'],
+            'pid': proc['pid'],
+            'path': proc['path'],
+            'create_time': proc.get('create_time'),
+            'description': f"Known high-risk tool detected: {proc['name']}",
+            'timestamp': timestamp if timestamp is not None else now()
+        }
+    return None
+
+
+def check_service(svc, timestamp=None):
+    """
+    Check a single service for a suspicious configuration or path
+    timestamp: Epoch to stamp the alert with
+    Returns: Alert dictionary, or None
+    """
+    if svc['path'] == 'N/A':
+        return None
+
+    svc_path = svc['path'].lower()
+
+    # Check for suspicious service paths
+    sus_path = SUSPICIOUS_SERVICE_PATH_MATCHER.first_match(svc_path)
+    is_suspicious = sus_path is not None
+    sus_reason = f"Service running from suspicious location: {sus_path}" if is_suspicious else ""
+
+    # Check if service is NOT in legitimate paths
+    is_legitimate = LEGITIMATE_SERVICE_PATH_MATCHER.matches(svc_path)
+
+    # Additional check: skip if it's from Program Files
+    if (is_suspicious or not is_legitimate) and 'program files' not in svc_path:
+        return {
+            'severity': 'MEDIUM',
+            'type': 'Suspicious Service Configuration',
+            'service_name': svc['name'],
+            'display_name': svc['display_name'],
+            'path': svc['path'],
+            'state': svc['state'],
+            'startup_type': svc['startup_type'],
+            'description': sus_reason if sus_reason else "Service in unusual location",
+            'timestamp': timestamp if timestamp is not None else now()
+        }
+    return None
+
+
+def is_reused_parent(parent_proc, child):
+    """
+    Check if a parent record actually belongs to a newer process that reused the PID
+    A parent created after its child can't be the real parent.
+    """
+    return bool(parent_proc['create_time'] and child['create_time']
+                and parent_proc['create_time'] > child['create_time'])
+
+
+# Per-record check for each run_all_detections() category
+RULE_CHECKS = {
+    'parent_child': check_parent_child,
+    'process_chains': check_process_chain,
+    'suspicious_paths': check_process_path,
+    'suspicious_names': check_process_name,
+    'suspicious_services': check_service
+}
+
+# Cumulative rule_profiler.RuleProfiler while profiling is enabled
+RULE_PROFILER = None
+
+
+def enable_rule_profiling():
+    """
+    Start counting per-rule evaluations, matches and time across all scans
+    Returns: The active RuleProfiler
+    """
+    global RULE_PROFILER
+    if RULE_PROFILER is None:
+        RULE_PROFILER = RuleProfiler()
+    return RULE_PROFILER
+
+
+def disable_rule_profiling():
+    """
+    Stop profiling - checks go back to the uninstrumented functions
+    """
+    global RULE_PROFILER
+    RULE_PROFILER = None
+
+
+def get_rule_stats():
+    """
+    Cumulative per-rule stats and noise flags
+    Returns: Dictionary of stats, or None if profiling is disabled
+    """
+    return RULE_PROFILER.get_stats() if RULE_PROFILER is not None else None
+
+
+def record_rule_pass(rule_id, evaluations, alerts, elapsed):
+    """
+    Add a batch pass run outside run_all_detections() (e.g. detect_suspicious_services())
+    to the profiler - no-op while profiling is disabled
+    """
+    if RULE_PROFILER is not None:
+        RULE_PROFILER.record(rule_id, evaluations, alerts, elapsed)
+
+
+def _active_checks():
+    """
+    The per-record check functions to call - profiled wrappers while profiling is enabled
+    Returns: RULE_CHECKS or its profiled equivalent
+    """
+    profiler = RULE_PROFILER
+    return RULE_CHECKS if profiler is None else profiler.wrap_checks(RULE_CHECKS)
+
+
+def check_process_cached(proc, verdict_cache, timestamp=None, checks=None):
+    """
+    Run the name and path rules through a verdict cache
+    The key has no parent (verdict_key(proc, None)) - the parent isn't always known
+    yet when a process arrives, and the parent-child rule is one lookup anyway
+    checks: Check functions to call (default: _active_checks())
+    Returns: List of (category, alert) tuples
+    """
+    key = verdict_key(proc, None)
+    verdict = verdict_cache.get(key)
+    if verdict is not None and not verdict:
+        return []  # Known-clean tuple - the common case
+
+    checks = checks or _active_checks()
+    found = []
+    if verdict is None or 'suspicious_names' in verdict:
+        alert = checks['suspicious_names'](proc, timestamp)
+        if alert:
+            found.append(('suspicious_names', alert))
+    if verdict is None or 'suspicious_paths' in verdict:
+        alert = checks['suspicious_paths'](proc, timestamp)
+        if alert:
+            found.append(('suspicious_paths', alert))
+
+    if verdict is None:
+        verdict_cache.put(key, tuple(category for category, _ in found))
+    return found
+
+
+def detect_process_start(proc, parent_proc=None, timestamp=None, rule_engine=None, pid_to_process=None,
+                         temporal_engine=None, verdict_cache=None):
+    """
+    Run every per-process rule against a process that just started
+    Used by event-driven monitoring (proc_events.py), where detections run per
+    process event instead of per full scan
+    parent_proc: Record of the parent process, if known
+    rule_engine: Optional rule_engine.RuleEngine with custom rules to run as well
+    pid_to_process: Optional PID -> process lookup (anything with .get) for multi-level chain rules
+    temporal_engine: Optional temporal_rules.TemporalRuleEngine - its alerts use category 'temporal'
+    verdict_cache: Optional verdict_cache.VerdictCache for the name and path rules (see
+                   check_process_cached() - the caller validates it against the rules)
+    Returns: List of (category, alert) tuples using run_all_detections() categories
+    """
+    checks = _active_checks()
+
+    if verdict_cache is not None:
+        alerts = check_process_cached(proc, verdict_cache, timestamp, checks)
+    else:
+        alerts = []
+        alert = checks['suspicious_names'](proc, timestamp)
+        if alert:
+            alerts.append(('suspicious_names', alert))
+
+        alert = checks['suspicious_paths'](proc, timestamp)
+        if alert:
+            alerts.append(('suspicious_paths', alert))
+
+    if parent_proc is not None and (parent_proc is proc or is_reused_parent(parent_proc, proc)):
+        parent_proc = None
+
+    if parent_proc is not None:
+        alert = checks['parent_child'](parent_proc, proc, timestamp)
+        if alert:
+            alerts.append(('parent_child', alert))
+
+    if parent_proc is not None and pid_to_process is not None:
+        alert = checks['process_chains'](proc, pid_to_process, timestamp=timestamp)
+        if alert:
+            alerts.append(('process_chains', alert))
+
+    if rule_engine is not None:
+        alerts.extend(('custom_rules', alert) for alert in rule_engine.check_process(proc, parent_proc, timestamp))
+
+    if temporal_engine is not None:
+        alerts.extend(('temporal', alert) for alert in temporal_engine.process_started(proc, parent_proc, timestamp))
+
+    return alerts
+
+
+def detect_suspicious_parent_child(process_tree, pid_to_process, tree_index=None):
     """
     Detect anomalous parent-child process relationships
+    Each process is probed once by its own name in CHILD_TO_PARENTS; only on a
+    hit is its parent's name looked up, so most processes cost one hash probe.
+    process_tree: Kept for compatibility - edges are read from pid_to_process
+    tree_index: Optional core_mon.ProcessTreeIndex - used to ignore children whose
+                parent PID was reused by an unrelated process
     Returns: List of alerts
     """
     alerts = []
 
     print("[*] Checking for suspicious parent-child relationships...")
 
-    for parent_pid, children in process_tree.items():
-        # Get parent process info
-        parent_proc = pid_to_process.get(parent_pid)
+    scan_time = now()
+    child_to_parents = CHILD_TO_PARENTS
 
-        if not parent_proc:
+    for child in pid_to_process.values():
+        forbidden_parents = child_to_parents.get(child['name'].lower())
+        if not forbidden_parents:
             continue
 
-        parent_name = parent_proc['name'].lower()
+        parent_pid = child['ppid']
+        parent_proc = pid_to_process.get(parent_pid)
+        if not parent_proc or parent_proc is child:
+            continue
 
-        # Check if parent is in our suspicious parent list
-        if parent_name in SUSPICIOUS_PARENT_CHILD:
-            suspicious_children = SUSPICIOUS_PARENT_CHILD[parent_name]
+        # The recorded parent PID now belongs to a different process
+        if tree_index is not None and tree_index.parent_of(child['pid']) != parent_pid:
+            continue
 
-            for child in children:
-                child_name = child['name'].lower()
-
-                # Check if child matches suspicious pattern
-                if child_name in suspicious_children:
-                    alert = {
-                        'severity': 'HIGH',
-                        'type': 'Suspicious Parent-Child Relationship',
-                        'parent_name': parent_proc['name'],
-                        'parent_pid': parent_pid,
-                        'child_name': child['name'],
-                        'child_pid': child['pid'],
-                        'child_path': child['path'],
-                        'description': f"{parent_proc['name']} spawned {child['name']} - Potential malware execution",
-                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    alerts.append(alert)
+        if parent_proc['name'].lower() in forbidden_parents:
+            alerts.append(check_parent_child(parent_proc, child, scan_time))
 
     print(f"[+] Found {len(alerts)} suspicious parent-child relationships")
     return alerts
 
 
-def detect_suspicious_paths(processes):
+def detect_suspicious_process_chains(pid_to_process, tree_index=None):
     """
-    Detect processes running from suspicious/risky locations
+    Detect multi-level chains such as winword.exe -> cmd.exe -> powershell.exe
+    tree_index: Optional core_mon.ProcessTreeIndex - its memoized ancestor chains are reused
     Returns: List of alerts
     """
-    alerts = []
+    print("[*] Checking for suspicious process chains...")
 
-    print("[*] Checking for processes in suspicious paths...")
+    scan_time = now()
+    alerts = []
+    for proc in pid_to_process.values():
+        if proc['name'].lower() in PROCESS_CHAIN_INDEX:
+            alert = check_process_chain(proc, pid_to_process, tree_index, scan_time)
+            if alert:
+                alerts.append(alert)
 
-    for proc in processes:
-        if not proc['path']:
-            continue
+    print(f"[+] Found {len(alerts)} suspicious process chains")
+    return alerts
 
-        proc_path = proc['path'].lower()
 
-        # Skip legitimate system processes
-        if proc['name'] in LEGITIMATE_PROCESSES:
-            continue
+def detect_suspicious_paths(processes):
+    """
+    Detect processes running from suspicious/risky locations
+    Returns: List of alerts
+    """
+    print("[*] Checking for processes in suspicious paths...")
 
-        # Check against suspicious paths
-        for sus_path in SUSPICIOUS_PATHS:
-            if sus_path.lower() in proc_path:
-                alert = {
-                    'severity': 'MEDIUM',
-                    'type': 'Suspicious Process Path',
-                    'process_name': proc['name'],
-                    'pid': proc['pid'],
-                    'path': proc['path'],
-                    'description': f"Process running from risky location: {sus_path}",
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                alerts.append(alert)
-                break  # Only alert once per process
+    scan_time = now()
+    alerts = [alert for alert in (check_process_path(proc, scan_time) for proc in processes) if alert]
 
     print(f"[+] Found {len(alerts)} processes in suspicious paths")
     return alerts
@@ -166,26 +519,99 @@ def detect_suspicious_process_names(processes):
     Detect known malicious or high-risk process names
     Returns: List of alerts
     """
-    alerts = []
-
     print("[*] Checking for suspicious process names...")
 
+    scan_time = now()
+    alerts = [alert for alert in (check_process_name(proc, scan_time) for proc in processes) if alert]
+
+    print(f"[+] Found {len(alerts)} high-risk processes")
+    return alerts
+
+
+# Rules whose verdict only depends on verdict_key() - evaluated through a VerdictCache
+CACHED_RULES = ('parent_child', 'suspicious_paths', 'suspicious_names')
+
+
+def rules_fingerprint():
+    """
+    Fingerprint of every rule list and whitelist the cached rules read
+    Changes whenever a list is edited, so VerdictCache.validate() drops stale verdicts
+    """
+    return hash((
+        tuple((parent, tuple(children)) for parent, children in SUSPICIOUS_PARENT_CHILD.items()),
+        tuple(SUSPICIOUS_PATHS),
+        tuple(SUSPICIOUS_PROCESS_NAMES),
+        tuple(LEGITIMATE_PROCESSES),
+        id(CHILD_TO_PARENTS),
+        id(SUSPICIOUS_PATH_MATCHER)
+    ))
+
+
+def verdict_key(proc, parent_proc):
+    """
+    (name, path, parent name, user) key for the verdict cache
+    Values are used as reported - lowering every field costs more than the rules
+    it saves, and a case variant (C:\\WINDOWS vs C:\\Windows) just takes its own entry
+    """
+    return (proc['name'], proc['path'], parent_proc['name'] if parent_proc is not None else None,
+            proc.get('user'))
+
+
+def detect_cached_process_rules(processes, pid_to_process, verdict_cache, tree_index=None):
+    """
+    Run the parent-child, path and name rules through a verdict cache
+    Only processes with a new (name, path, parent name, user) tuple are evaluated;
+    for known tuples the cached verdict says which rules fire, and only those
+    are run again to build alerts for this process.
+    verdict_cache: verdict_cache.VerdictCache - invalidated here if the rules changed
+    Returns: Dictionary with CACHED_RULES alert lists
+    """
+    print("[*] Checking parent-child, path and name rules (verdict cache)...")
+
+    verdict_cache.validate(rules_fingerprint())
+    scan_time = now()
+    alerts = {category: [] for category in CACHED_RULES}
+    hits, misses = verdict_cache.hits, verdict_cache.misses
+
     for proc in processes:
-        proc_name = proc['name'].lower()
+        parent_proc = pid_to_process.get(proc['ppid'])
+        if parent_proc is not None:
+            # Rows are compared by value - a ProcessTable hands out a new row object per access
+            if parent_proc['pid'] == proc['pid'] or (tree_index is not None and
+                                                     tree_index.parent_of(proc['pid']) != proc['ppid']):
+                parent_proc = None
+            else:
+                # Parent-child edges are checked once per PID, like detect_suspicious_parent_child()
+                latest = pid_to_process.get(proc['pid'])
+                if latest is None or latest.get('create_time') != proc.get('create_time'):
+                    parent_proc = None
 
-        if proc_name in SUSPICIOUS_PROCESS_NAMES:
-            alert = {
-                'severity': 'CRITICAL',
-                'type': 'High-Risk Process Detected',
-                'process_name': proc['name'],
-                'pid': proc['pid'],
-                'path': proc['path'],
-                'description': f"Known high-risk tool detected: {proc['name']}",
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            alerts.append(alert)
+        key = verdict_key(proc, parent_proc)
+        verdict = verdict_cache.get(key)
+        if verdict is not None and not verdict:
+            continue  # Known-clean tuple - the common case
 
-    print(f"[+] Found {len(alerts)} high-risk processes")
+        found = []
+        if verdict is None or 'suspicious_names' in verdict:
+            alert = check_process_name(proc, scan_time)
+            if alert:
+                found.append(('suspicious_names', alert))
+        if verdict is None or 'suspicious_paths' in verdict:
+            alert = check_process_path(proc, scan_time)
+            if alert:
+                found.append(('suspicious_paths', alert))
+        if parent_proc is not None and (verdict is None or 'parent_child' in verdict):
+            alert = check_parent_child(parent_proc, proc, scan_time)
+            if alert:
+                found.append(('parent_child', alert))
+
+        if verdict is None:
+            verdict_cache.put(key, tuple(category for category, _ in found))
+        for category, alert in found:
+            alerts[category].append(alert)
+
+    print(f"[+] Found {sum(len(found) for found in alerts.values())} alerts "
+          f"({verdict_cache.hits - hits} cache hits, {verdict_cache.misses - misses} misses)")
     return alerts
 
 
@@ -194,73 +620,462 @@ def detect_suspicious_services(services):
     Detect services with suspicious configurations or paths
     Returns: List of alerts
     """
-    alerts = []
-
     print("[*] Checking for suspicious service configurations...")
 
-    for svc in services:
-        if svc['path'] == 'N/A':
-            continue
-
-        svc_path = svc['path'].lower()
-        is_suspicious = False
-        sus_reason = ""
-
-        # Check for suspicious service paths
-        for sus_path in SUSPICIOUS_SERVICE_PATHS:
-            if sus_path.lower() in svc_path:
-                is_suspicious = True
-                sus_reason = f"Service running from suspicious location: {sus_path}"
-                break
-
-        # Check if service is NOT in legitimate paths
-        is_legitimate = any(leg_path.lower() in svc_path for leg_path in LEGITIMATE_SERVICE_PATHS)
-
-        if is_suspicious or not is_legitimate:
-            # Additional check: skip if it's from Program Files
-            if 'program files' not in svc_path:
-                alert = {
-                    'severity': 'MEDIUM',
-                    'type': 'Suspicious Service Configuration',
-                    'service_name': svc['name'],
-                    'display_name': svc['display_name'],
-                    'path': svc['path'],
-                    'state': svc['state'],
-                    'startup_type': svc['startup_type'],
-                    'description': sus_reason if sus_reason else "Service in unusual location",
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                alerts.append(alert)
+    scan_time = now()
+    alerts = [alert for alert in (check_service(svc, scan_time) for svc in services) if alert]
 
     print(f"[+] Found {len(alerts)} suspicious services")
     return alerts
 
 
-def run_all_detections(processes, process_tree, pid_to_process, services):
+def run_all_detections(processes, process_tree, pid_to_process, services, tree_index=None, rule_engine=None,
+                       verdict_cache=None):
     """
     Run all detection rules and combine results
-    Returns: Dictionary of all alerts categorized by type
+    Each rule pass is timed (a handful of clock reads per scan); the per-rule
+    evaluations, matches and time of this run are in the result's rule_stats,
+    and are added to RULE_PROFILER when profiling is enabled.
+    tree_index: Optional core_mon.ProcessTreeIndex for PID-reuse aware parent-child checks
+    rule_engine: Optional rule_engine.RuleEngine - its matches are added under 'custom_rules'
+    verdict_cache: Optional verdict_cache.VerdictCache kept between calls - the CACHED_RULES
+                   then only run for unseen (name, path, parent name, user) tuples
+    Returns: DetectionResults - dictionary of all alerts categorized by type
     """
     print("\n" + "=" * 60)
     print("🔍 RUNNING ALL DETECTION RULES")
     print("=" * 60 + "\n")
 
+    passes = [
+        ('parent_child', len(pid_to_process),
+         lambda: detect_suspicious_parent_child(process_tree, pid_to_process, tree_index)),
+        ('process_chains', len(pid_to_process),
+         lambda: detect_suspicious_process_chains(pid_to_process, tree_index)),
+        ('suspicious_paths', len(processes), lambda: detect_suspicious_paths(processes)),
+        ('suspicious_names', len(processes), lambda: detect_suspicious_process_names(processes)),
+        ('suspicious_services', len(services), lambda: detect_suspicious_services(services))
+    ]
+    if rule_engine is not None:
+        passes.append(('custom_rules', len(processes) + len(services),
+                       lambda: rule_engine.detect(processes, pid_to_process, services)))
+
+    run_profile = RuleProfiler()
+    all_alerts = DetectionResults((category, []) for category, _, _ in passes)
+
+    if verdict_cache is not None:
+        start = time.perf_counter()
+        cached_alerts = detect_cached_process_rules(processes, pid_to_process, verdict_cache, tree_index)
+        all_alerts.update(cached_alerts)
+        run_profile.record('verdict_cache', len(processes), [alert for alerts in cached_alerts.values()
+                                                             for alert in alerts], time.perf_counter() - start)
+        passes = [entry for entry in passes if entry[0] not in CACHED_RULES]
+
+    for category, evaluations, run in passes:
+        start = time.perf_counter()
+        all_alerts[category] = run()
+        run_profile.record(category, evaluations, all_alerts[category], time.perf_counter() - start)
+
+    all_alerts.rule_stats = run_profile.get_stats()
+    if RULE_PROFILER is not None:
+        RULE_PROFILER.merge(run_profile)
+
+    total_alerts = sum(len(alerts) for alerts in all_alerts.values())
+
+    print("\n" + "=" * 60)
+    print(f"✅ DETECTION COMPLETE - {total_alerts} total alerts")
+    print("=" * 60)
+
+    return all_alerts
+
+
+def run_streaming_detections(process_stream, services=None, on_alert=None, collector=None, rule_engine=None,
+                             verdict_cache=None):
+    """
+    Run detections while processes are still being enumerated
+    Per-process rules (names, paths) fire as each record arrives, so the first
+    alert doesn't wait for the whole scan. Tree-dependent rules (parent-child)
+    run in a final pass once every process has been seen.
+
+    process_stream: Iterable of process records, e.g. core_mon.iter_processes()
+    on_alert: Optional callback invoked with each alert as soon as it is raised
+    collector: Optional list-like object (with append) that receives every record,
+               defaults to a new list
+    rule_engine: Optional rule_engine.RuleEngine - its matches are added under 'custom_rules'
+    verdict_cache: Optional verdict_cache.VerdictCache kept between scans - the name and
+                   path rules then only run for unseen (name, path, user) tuples
+    Returns: (alerts dictionary in run_all_detections() format, collected processes)
+    """
+    print("\n" + "=" * 60)
+    print("🔍 RUNNING STREAMING DETECTIONS")
+    print("=" * 60 + "\n")
+
+    processes = [] if collector is None else collector
+    scan_time = now()
     all_alerts = {
-        'parent_child': detect_suspicious_parent_child(process_tree, pid_to_process),
-        'suspicious_paths': detect_suspicious_paths(processes),
-        'suspicious_names': detect_suspicious_process_names(processes),
-        'suspicious_services': detect_suspicious_services(services)
+        'parent_child': [],
+        'process_chains': [],
+        'suspicious_paths': [],
+        'suspicious_names': [],
+        'suspicious_services': []
     }
+    if rule_engine is not None:
+        all_alerts['custom_rules'] = []
+
+    def emit(category, alert):
+        all_alerts[category].append(alert)
+        if on_alert:
+            on_alert(alert)
+
+    checks = _active_checks()
+    if verdict_cache is not None:
+        verdict_cache.validate(rules_fingerprint())
+
+    # Pass 1 - per-process rules as records arrive
+    pid_to_process = {}
+    for proc in process_stream:
+        processes.append(proc)
+        pid_to_process[proc['pid']] = proc
+
+        if verdict_cache is not None:
+            for category, alert in check_process_cached(proc, verdict_cache, scan_time, checks):
+                emit(category, alert)
+            continue
+
+        alert = checks['suspicious_names'](proc, scan_time)
+        if alert:
+            emit('suspicious_names', alert)
+
+        alert = checks['suspicious_paths'](proc, scan_time)
+        if alert:
+            emit('suspicious_paths', alert)
+
+    # Pass 2 - rules that need the full tree
+    for proc in pid_to_process.values():
+        parent = pid_to_process.get(proc['ppid'])
+        if parent is proc or (parent is not None and is_reused_parent(parent, proc)):
+            parent = None
+
+        if parent is not None:
+            alert = checks['parent_child'](parent, proc, scan_time)
+            if alert:
+                emit('parent_child', alert)
+
+            alert = checks['process_chains'](proc, pid_to_process, timestamp=scan_time)
+            if alert:
+                emit('process_chains', alert)
+
+        if rule_engine is not None:
+            for alert in rule_engine.check_process(proc, parent, scan_time):
+                emit('custom_rules', alert)
+
+    for svc in services or ():
+        alert = checks['suspicious_services'](svc, scan_time)
+        if alert:
+            emit('suspicious_services', alert)
+
+        if rule_engine is not None:
+            for alert in rule_engine.check_service(svc, scan_time):
+                emit('custom_rules', alert)
 
     total_alerts = sum(len(alerts) for alerts in all_alerts.values())
 
+    print(f"[+] Streamed {len(pid_to_process)} processes")
     print("\n" + "=" * 60)
     print(f"✅ DETECTION COMPLETE - {total_alerts} total alerts")
     print("=" * 60)
 
+    return all_alerts, processes
+
+
+def service_fingerprint(svc):
+    """
+    The service attributes the service rules look at - a change means re-check
+    """
+    return (svc['path'], svc['state'], svc['startup_type'])
+
+
+def run_delta_detections(delta, pid_to_process, process_tree=None, services=None, service_state=None,
+                         rule_engine=None, on_alert=None, temporal_engine=None, verdict_cache=None):
+    """
+    Run detections only for what changed since the previous scan
+    Per-process rules run for started/changed processes, parent-child rules only
+    for edges with a new or changed endpoint, and service rules only for services
+    that are new or whose path/state/startup type changed - so steady-state cost
+    follows churn instead of host size, and alerts aren't re-emitted every scan.
+
+    delta: Snapshot delta from core_mon.diff_snapshots() or IncrementalScanner.scan()
+    pid_to_process: PID -> process mapping for the current snapshot
+    process_tree: Optional parent PID -> children mapping, used to re-check the
+                  children of changed processes
+    services: Current service list, checked against service_state
+    service_state: Dictionary kept by the caller between scans (service name -> fingerprint);
+                   updated in place. Without it every service is checked.
+    rule_engine: Optional rule_engine.RuleEngine - its matches are added under 'custom_rules'
+    on_alert: Optional callback invoked with each alert
+    temporal_engine: Optional temporal_rules.TemporalRuleEngine fed with the started and
+                     exited processes - its alerts are added under 'temporal'
+    verdict_cache: Optional verdict_cache.VerdictCache for the name and path rules
+    Returns: Dictionary of new alerts in run_all_detections() format
+    """
+    scan_time = now()
+    all_alerts = {
+        'parent_child': [],
+        'process_chains': [],
+        'suspicious_paths': [],
+        'suspicious_names': [],
+        'suspicious_services': []
+    }
+    if rule_engine is not None:
+        all_alerts['custom_rules'] = []
+    if temporal_engine is not None:
+        all_alerts['temporal'] = []
+
+    def emit(category, alert):
+        all_alerts[category].append(alert)
+        if on_alert:
+            on_alert(alert)
+
+    checks = _active_checks()
+    if verdict_cache is not None:
+        verdict_cache.validate(rules_fingerprint())
+    changed = delta.get('changed', [])
+    candidates = delta['started'] + changed
+    print(f"[*] Delta detection: {len(delta['started'])} started, {len(changed)} changed, "
+          f"{len(delta['exited'])} exited")
+
+    started_count = len(delta['started'])
+    for position, proc in enumerate(candidates):
+        parent = pid_to_process.get(proc['ppid'])
+        if parent is proc or (parent is not None and is_reused_parent(parent, proc)):
+            parent = None
+
+        # Only new processes are start events for the temporal rules
+        temporal = temporal_engine if position < started_count else None
+        for category, alert in detect_process_start(proc, parent, scan_time, rule_engine, pid_to_process,
+                                                    temporal, verdict_cache):
+            emit(category, alert)
+
+    if temporal_engine is not None:
+        for proc in delta['exited']:
+            for alert in temporal_engine.process_exited(proc, scan_time):
+                emit('temporal', alert)
+
+    # A changed process is also a changed parent - re-check its existing children
+    if process_tree is not None:
+        new_pids = {proc['pid'] for proc in delta['started']}
+        for parent in changed:
+            for child in process_tree.get(parent['pid'], ()):
+                if child['pid'] in new_pids or child is parent or is_reused_parent(parent, child):
+                    continue  # New children were checked above
+                alert = checks['parent_child'](parent, child, scan_time)
+                if alert:
+                    emit('parent_child', alert)
+
+    if services is not None:
+        checked = 0
+        for svc in services:
+            if service_state is not None:
+                fingerprint = service_fingerprint(svc)
+                if service_state.get(svc['name']) == fingerprint:
+                    continue
+                service_state[svc['name']] = fingerprint
+
+            checked += 1
+            alert = checks['suspicious_services'](svc, scan_time)
+            if alert:
+                emit('suspicious_services', alert)
+            if rule_engine is not None:
+                for alert in rule_engine.check_service(svc, scan_time):
+                    emit('custom_rules', alert)
+
+        if service_state is not None:
+            current_names = {svc['name'] for svc in services}
+            for name in [name for name in service_state if name not in current_names]:
+                del service_state[name]
+        print(f"[*] Checked {checked} new/changed services")
+
+    total_alerts = sum(len(alerts) for alerts in all_alerts.values())
+    print(f"[+] Delta detection found {total_alerts} new alerts")
     return all_alerts
 
 
+def benchmark_delta_detections(count=100000, churn_ratio=0.001, rounds=5, seed=1):
+    """
+    Compare a full detection pass against the delta-only pass on a synthetic host
+    The snapshot diff is timed separately - live scans get their delta from
+    IncrementalScanner without diffing a full list
+    Returns: Dictionary with average seconds per scan for each mode
+    """
+    import io
+    import time
+    import contextlib
+    from core_mon import build_process_tree, diff_snapshots
+    from process_sources import SyntheticProcessSource, SyntheticServiceSource
+
+    process_source = SyntheticProcessSource(count, churn_ratio=churn_ratio, seed=seed)
+    services = SyntheticServiceSource(seed=seed).get_services()
+
+    processes = process_source.get_processes()
+    _, snapshot = diff_snapshots({}, processes)
+    service_state = {}
+    full_time = delta_time = diff_time = 0.0
+    churn = 0
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_tree, pid_to_process = build_process_tree(processes)
+        run_delta_detections({'started': [], 'exited': []}, pid_to_process,
+                             services=services, service_state=service_state)
+
+        for _ in range(rounds):
+            processes = process_source.get_processes()
+            process_tree, pid_to_process = build_process_tree(processes)
+
+            start = time.perf_counter()
+            run_all_detections(processes, process_tree, pid_to_process, services)
+            full_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            delta, snapshot = diff_snapshots(snapshot, processes)
+            diff_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            run_delta_detections(delta, pid_to_process, process_tree, services, service_state)
+            delta_time += time.perf_counter() - start
+            churn += len(delta['started']) + len(delta['exited'])
+
+    return {
+        'processes': len(processes),
+        'avg_churn': churn / rounds,
+        'full_seconds': full_time / rounds,
+        'delta_seconds': delta_time / rounds,
+        'diff_seconds': diff_time / rounds
+    }
+
+
+def benchmark_parent_child(count=100000, rounds=5, seed=1):
+    """
+    Compare the old per-parent walk over process_tree against the child-name
+    reverse map, and time multi-level chain detection, on a synthetic tree
+    Returns: Dictionary with average seconds per pass
+    """
+    import io
+    import time
+    import contextlib
+    from core_mon import build_process_tree, build_tree_index
+    from process_sources import SyntheticProcessSource
+
+    processes = SyntheticProcessSource(count, suspicious_chain_ratio=0.01, seed=seed).get_processes()
+
+    def parent_walk(process_tree, pid_to_process):
+        # Previous implementation - every parent, then each child against its list
+        alerts = []
+        for parent_pid, children in process_tree.items():
+            parent_proc = pid_to_process.get(parent_pid)
+            if not parent_proc:
+                continue
+            suspicious_children = SUSPICIOUS_PARENT_CHILD.get(parent_proc['name'].lower())
+            if not suspicious_children:
+                continue
+            for child in children:
+                if child['name'].lower() in suspicious_children:
+                    alerts.append((parent_pid, child['pid']))
+        return alerts
+
+    timings = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_tree, pid_to_process = build_process_tree(processes)
+        tree_index = build_tree_index(processes)
+
+        passes = {
+            'parent_walk': lambda: parent_walk(process_tree, pid_to_process),
+            'reverse_map': lambda: detect_suspicious_parent_child(process_tree, pid_to_process),
+            'chains': lambda: detect_suspicious_process_chains(pid_to_process),
+            'chains_indexed': lambda: detect_suspicious_process_chains(pid_to_process, tree_index)
+        }
+        for label, run in passes.items():
+            run()
+            start = time.perf_counter()
+            for _ in range(rounds):
+                found = run()
+            timings[label] = (time.perf_counter() - start) / rounds
+            timings[label + '_found'] = len(found)
+
+    timings['processes'] = len(processes)
+    return timings
+
+
+def benchmark_verdict_cache(count=100000, rounds=3, seed=1, max_entries=65536):
+    """
+    Compare run_all_detections() with and without a warm verdict cache
+    Returns: Dictionary with seconds per scan, cache stats and whether the alerts match
+    """
+    import io
+    import contextlib
+    from core_mon import build_process_tree
+    from process_sources import SyntheticProcessSource
+    from verdict_cache import VerdictCache
+
+    processes = SyntheticProcessSource(count, seed=seed).get_processes()
+    cache = VerdictCache(max_entries)
+
+    def timed(verdict_cache):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            alerts = run_all_detections(processes, process_tree, pid_to_process, [], verdict_cache=verdict_cache)
+        return (time.perf_counter() - start) / rounds, alerts
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_tree, pid_to_process = build_process_tree(processes)
+        uncached, plain_alerts = timed(None)
+        start = time.perf_counter()
+        run_all_detections(processes, process_tree, pid_to_process, [], verdict_cache=cache)
+        cold = time.perf_counter() - start
+        warm, cached_alerts = timed(cache)
+
+    def comparable(alerts):
+        return {category: sorted(repr(sorted((k, v) for k, v in alert.items() if k != 'timestamp'))
+                                 for alert in found)
+                for category, found in alerts.items()}
+
+    return {
+        'processes': count,
+        'uncached_seconds': uncached,
+        'cold_seconds': cold,
+        'warm_seconds': warm,
+        'same_alerts': comparable(plain_alerts) == comparable(cached_alerts),
+        'stats': cache.get_stats()
+    }
+
+
+def benchmark_rule_profiling(count=100000, rounds=3, seed=1):
+    """
+    Cost of a streaming detection pass with rule profiling disabled and enabled
+    Returns: Dictionary with seconds per pass and the profiled rule stats
+    """
+    import io
+    import contextlib
+    from process_sources import SyntheticProcessSource
+
+    processes = SyntheticProcessSource(count, seed=seed).get_processes()
+
+    def timed():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            run_streaming_detections(processes)
+        return (time.perf_counter() - start) / rounds
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        disabled = timed()
+        profiler = enable_rule_profiling()
+        try:
+            enabled = timed()
+            stats = profiler.get_stats()
+        finally:
+            disable_rule_profiling()
+
+    return {'processes': count, 'disabled_seconds': disabled, 'enabled_seconds': enabled, 'stats': stats}
+
+
 # Test function - Only runs when file is executed directly
 if __name__ == "__main__":
     print("\n" + "=" * 60)
@@ -276,6 +1091,7 @@ if __name__ == "__main__":
 
     print("📋 LOADED DETECTION RULES:")
     print(f"   Suspicious Parent-Child Patterns: {len(SUSPICIOUS_PARENT_CHILD)}")
+    print(f"   Suspicious Process Chains: {len(SUSPICIOUS_PROCESS_CHAINS)}")
     print(f"   Suspicious Paths: {len(SUSPICIOUS_PATHS)}")
     print(f"   High-Risk Process Names: {len(SUSPICIOUS_PROCESS_NAMES)}")
     print(f"   Legitimate Processes Whitelist: {len(LEGITIMATE_PROCESSES)}")
@@ -290,6 +1106,37 @@ if __name__ == "__main__":
     for path in SUSPICIOUS_PATHS[:5]:
         print(f"      {path}")
 
+    print("\n⏱️ PARENT-CHILD RULES (100k processes):")
+    result = benchmark_parent_child()
+    print(f"   Per-parent walk     : {result['parent_walk'] * 1000:7.1f} ms ({result['parent_walk_found']} edges)")
+    print(f"   Child-name index    : {result['reverse_map'] * 1000:7.1f} ms ({result['reverse_map_found']} edges)")
+    print(f"   Chains (parent walk): {result['chains'] * 1000:7.1f} ms ({result['chains_found']} chains)")
+    print(f"   Chains (tree index) : {result['chains_indexed'] * 1000:7.1f} ms ({result['chains_indexed_found']} chains)")
+
+    print("\n⏱️ FULL vs DELTA DETECTION (100k processes, 0.1% churn per scan):")
+    result = benchmark_delta_detections()
+    print(f"   Full pass : {result['full_seconds'] * 1000:8.1f} ms per scan")
+    print(f"   Delta pass: {result['delta_seconds'] * 1000:8.1f} ms per scan "
+          f"(~{result['avg_churn']:.0f} started/exited)")
+    print(f"   Snapshot diff (full-list sources only): {result['diff_seconds'] * 1000:.1f} ms")
+
+    print("\n⏱️ VERDICT CACHE (run_all_detections, 100k processes):")
+    result = benchmark_verdict_cache()
+    stats = result['stats']
+    print(f"   No cache  : {result['uncached_seconds'] * 1000:7.1f} ms per scan")
+    print(f"   Cold cache: {result['cold_seconds'] * 1000:7.1f} ms")
+    print(f"   Warm cache: {result['warm_seconds'] * 1000:7.1f} ms per scan (same alerts: {result['same_alerts']})")
+    print(f"   {stats['entries']} verdicts, hit ratio {stats['hit_ratio']:.1%}, {stats['evictions']} evictions")
+    print("\n⏱️ RULE PROFILING (streaming pass, 100k processes):")
+    result = benchmark_rule_profiling()
+    print(f"   Profiling off: {result['disabled_seconds'] * 1000:7.1f} ms")
+    print(f"   Profiling on : {result['enabled_seconds'] * 1000:7.1f} ms")
+    for rule in result['stats']['rules']:
+        print(f"   {rule['id']:20} evals={rule['evaluations']:7} matches={rule['matches']:5} "
+              f"avg={rule['avg_eval_us'] or 0:.2f} µs")
+        for reason in rule['noise']:
+            print(f"      [!] Noise: {reason}")
+
     print("\n✅ Detection Engine Ready!\n")
 # ```
 #
@@ -447,26 +447,160 @@ Windows Service & Process Monitoring Agent - Web Dashboard Version
 """
 
 import sys
+import argparse
 from web_interface import run_web_dashboard
+from process_sources import create_sources
+
+
+def parse_args():
+    """
+    Parse command-line options
+    """
+    parser = argparse.ArgumentParser(description="Windows Security Monitoring Agent")
+    parser.add_argument('--source', choices=['live', 'replay', 'synthetic'], default='live',
+                        help="Where process/service data comes from (default: live system)")
+    parser.add_argument('--replay-file', help="Recording to replay with --source replay")
+    parser.add_argument('--synthetic-count', type=int, default=100000,
+                        help="Number of processes to generate with --source synthetic")
+    parser.add_argument('--seed', type=int, help="Random seed for --source synthetic")
+    parser.add_argument('--port', type=int, default=5000, help="Dashboard port")
+    parser.add_argument('--continuous', action='store_true',
+                        help="Keep rescanning, adapting the interval to process churn")
+    parser.add_argument('--min-interval', type=float, default=1.0,
+                        help="Shortest interval between continuous scans (seconds)")
+    parser.add_argument('--max-interval', type=float, default=60.0,
+                        help="Longest interval between continuous scans when idle (seconds)")
+    parser.add_argument('--cpu-budget', type=float, default=0.05,
+                        help="Max fraction of one CPU spent on continuous scans (default 0.05)")
+    parser.add_argument('--rules', nargs='+', default=[], metavar='FILE',
+                        help="JSON/YAML custom rule files (reloaded automatically when changed)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Console mode - check each process as it starts instead of scanning")
+    parser.add_argument('--poll-interval', type=float, default=0.25,
+                        help="Seconds between polls when --watch can't use the process connector")
+    parser.add_argument('--temporal', action='store_true',
+                        help="Enable time-window rules: spawn bursts in --watch and --continuous "
+                             "modes, short-lived processes in --watch mode only (scans can't see exit times)")
+    parser.add_argument('--profile-rules', action='store_true',
+                        help="Count per-rule evaluations, matches and time (served at /api/rule-stats)")
+    parser.add_argument('--verbosity', choices=['quiet', 'brief', 'detailed'], default='detailed',
+                        help="Console alert output - full details, one line per alert, or none")
+    parser.add_argument('--quiet', action='store_const', const='quiet', dest='verbosity',
+                        help="Don't print alerts to the console (same as --verbosity quiet)")
+    parser.add_argument('--max-alert-rate', type=int, default=200,
+                        help="Alerts printed per second; the rest are summarized (0 for no limit)")
+    parser.add_argument('--journal', metavar='DIR',
+                        help="Append every alert to a JSON Lines journal in DIR (one file per run)")
+    parser.add_argument('--alert-db', metavar='FILE',
+                        help="Keep alerts in a SQLite database (survives restarts, indexed queries)")
+    parser.add_argument('--alert-memory', type=int, metavar='N',
+                        help="Alerts kept in RAM in --watch/--continuous mode; older ones spill to "
+                             "compressed files (default 20000, 0 keeps all in RAM)")
+    parser.add_argument('--spill-dir', metavar='DIR',
+                        help="Where spilled alerts go (default: a temporary directory)")
+    parser.add_argument('--parallel-workers', type=int, metavar='N',
+                        help="Shard per-process rules over N worker processes in full dashboard scans "
+                             "(falls back to one process when the snapshot is too small to benefit)")
+    return parser.parse_args()
+
+
+def load_rule_engine(rule_files):
+    """
+    Compile custom rule files and watch them for changes
+    Returns: RuleEngine, or None if no rule files were given
+    """
+    if not rule_files:
+        return None
+    from rule_engine import RuleEngine
+    engine = RuleEngine(rule_files)
+    engine.start_watching()
+    return engine
+
+
+def run_watch_mode(poll_interval, rule_engine=None, temporal_engine=None, journal_dir=None, alert_db=None,
+                   memory_budget=None, spill_dir=None):
+    """
+    Alert on suspicious processes as they start (event-driven, no dashboard)
+    """
+    from proc_events import open_event_source, monitor_process_events
+    from alert_sys import AlertManager
+    from alert_journal import AlertJournal
+
+    from alert_store import AlertStore
+
+    journal = AlertJournal.for_run(journal_dir) if journal_dir else None
+    store = AlertStore(alert_db) if alert_db else None
+    # Watch mode runs indefinitely - with a database, alerts live there instead of in memory
+    alert_manager = AlertManager(journal=journal, store=store, keep_alerts=store is None,
+                                 memory_budget=memory_budget if store is None else None, spill_dir=spill_dir)
+    source = open_event_source(poll_interval)
+    print(f"[*] Watching process events ({source.name}) - press Ctrl+C to stop\n")
+
+    try:
+        monitor_process_events(source, on_alert=alert_manager.add_alert, rule_engine=rule_engine,
+                               temporal_engine=temporal_engine)
+    except KeyboardInterrupt:
+        print("\n[*] Stopped watching")
+    finally:
+        source.close()
+        if journal:
+            journal.close()
+            print(f"[+] Alerts journaled to {journal.path}")
+        if store:
+            store.flush()
+
+    alert_manager.print_summary()
 
 
 def main():
     """
     Launch web-based security monitoring dashboard
     """
+    args = parse_args()
+
+    from alert_console import configure_console
+    from alert_tiers import DEFAULT_MEMORY_ALERTS
+    configure_console(verbosity=args.verbosity, max_rate=args.max_alert_rate)
+
+    # Long-running modes keep a bounded number of alerts in RAM
+    memory_budget = None
+    if args.watch or args.continuous:
+        memory_budget = DEFAULT_MEMORY_ALERTS if args.alert_memory is None else args.alert_memory or None
+
+    rule_engine = load_rule_engine(args.rules)
+    temporal_engine = None
+    if args.temporal:
+        from temporal_rules import TemporalRuleEngine, SCAN_KINDS
+        # Rescans only see exits to the scan interval - short-lived rules need the event feed
+        temporal_engine = TemporalRuleEngine(kinds=None if args.watch else SCAN_KINDS)
+
+    if args.watch:
+        run_watch_mode(args.poll_interval, rule_engine, temporal_engine, args.journal, args.alert_db,
+                       memory_budget, args.spill_dir)
+        return
+
     print("\n" + "=" * 60)
     print("  🔒 Windows Security Monitoring Agent")
     print("  Web Dashboard Mode")
     print("=" * 60 + "\n")
 
-    # Check if running on Windows
-    if sys.platform != 'win32':
+    # Check if running on Windows - replay/synthetic sources work anywhere
+    if args.source == 'live' and sys.platform != 'win32':
         print("[!] This tool is designed for Windows systems only")
+        print("    Use --source synthetic or --source replay on other platforms")
         sys.exit(1)
 
+    process_source, service_source = create_sources(args.source, args.replay_file,
+                                                    args.synthetic_count, args.seed)
+
     # Run web dashboard
-    run_web_dashboard()
+    run_web_dashboard(process_source, service_source, port=args.port, continuous=args.continuous,
+                      rule_engine=rule_engine, profile_rules=args.profile_rules,
+                      temporal_engine=temporal_engine, journal_dir=args.journal,
+                      alert_db=args.alert_db, memory_budget=memory_budget, spill_dir=args.spill_dir,
+                      min_interval=args.min_interval, max_interval=args.max_interval,
+                      cpu_budget=args.cpu_budget, parallel_workers=args.parallel_workers)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,204 @@
+"""
+path_matcher.py
+Multi-Pattern Path Matcher - Case-insensitive substring matching against many patterns at once
+Compiles pattern lists (suspicious paths, threat feed IOCs) into an Aho-Corasick automaton
+"""
+
+from collections import deque
+
+
+# Below this many patterns a plain scan over pre-lowered patterns is faster
+# than walking the automaton in Python (see benchmark_matcher())
+SMALL_PATTERN_LIMIT = 48
+
+NO_MATCH = -1
+
+
+class PathMatcher:
+    """
+    Case-insensitive multi-substring matcher
+
+    Patterns are lowered once at compile time; each path is lowered once and
+    scanned in a single pass, so cost no longer grows with the number of
+    patterns. Reports the matched pattern with the lowest index, which keeps
+    "first rule in the list wins" semantics.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.lowered = [pattern.lower() for pattern in self.patterns]
+        self.use_automaton = len(self.patterns) > SMALL_PATTERN_LIMIT
+
+        if self.use_automaton:
+            self._build()
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _build(self):
+        """
+        Build the trie, failure links and per-state best (lowest) match index
+        """
+        goto = [{}]
+        best = [NO_MATCH]
+
+        for index, pattern in enumerate(self.lowered):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    best.append(NO_MATCH)
+                state = next_state
+            if best[state] == NO_MATCH or index < best[state]:
+                best[state] = index
+
+        # Breadth-first: a state's failure target is always shallower, so it is final
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+
+                target = fail[state]
+                while target and ch not in goto[target]:
+                    target = fail[target]
+                fail_state = goto[target].get(ch, 0)
+                fail[next_state] = fail_state if fail_state != next_state else 0
+
+                # Inherit matches that end here through the failure link
+                inherited = best[fail[next_state]]
+                if inherited != NO_MATCH and (best[next_state] == NO_MATCH or inherited < best[next_state]):
+                    best[next_state] = inherited
+
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+
+    def match_index(self, text):
+        """
+        Find the lowest-index pattern contained in text (case-insensitive)
+        Returns: Pattern index, or -1 if nothing matches
+        """
+        if not text:
+            return NO_MATCH
+        text = text.lower()
+
+        if not self.use_automaton:
+            for index, pattern in enumerate(self.lowered):
+                if pattern in text:
+                    return index
+            return NO_MATCH
+
+        goto = self._goto
+        fail = self._fail
+        best = self._best
+        found = NO_MATCH
+        state = 0
+
+        for ch in text:
+            transitions = goto[state]
+            while ch not in transitions and state:
+                state = fail[state]
+                transitions = goto[state]
+            state = transitions.get(ch, 0)
+
+            index = best[state]
+            if index != NO_MATCH and (found == NO_MATCH or index < found):
+                found = index
+                if found == 0:
+                    break
+
+        return found
+
+    def first_match(self, text):
+        """
+        Find the first pattern (in list order) contained in text
+        Returns: The original pattern string, or None
+        """
+        index = self.match_index(text)
+        return self.patterns[index] if index != NO_MATCH else None
+
+    def matches(self, text):
+        """
+        Check if text contains any of the patterns
+        """
+        return self.match_index(text) != NO_MATCH
+
+
+def benchmark_matcher(pattern_counts=(10, 100, 1000, 10000), paths=2000, seed=7):
+    """
+    Compare the per-pattern loop (pattern.lower() in path.lower()) against
+    the compiled matcher as the pattern list grows
+    Returns: List of dictionaries with microseconds per path for each approach
+    """
+    import time
+    import random
+
+    rng = random.Random(seed)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz0123456789'
+
+    def word(length):
+        return ''.join(rng.choice(alphabet) for _ in range(length))
+
+    sample_paths = [
+        f"C:\\Users\\{word(6)}\\AppData\\Local\\{word(8)}\\{word(10)}.exe" if i % 2 else
+        f"C:\\Program Files\\{word(10)}\\bin\\{word(8)}.exe"
+        for i in range(paths)
+    ]
+
+    results = []
+    for count in pattern_counts:
+        patterns = [f"\\{word(rng.randint(5, 12))}\\" for _ in range(count)]
+        patterns[-1] = '\\Temp\\'  # Worst case for the loop - the likely hit is last
+
+        start = time.perf_counter()
+        for path in sample_paths:
+            for pattern in patterns:
+                if pattern.lower() in path.lower():
+                    break
+        naive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = PathMatcher(patterns)
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in sample_paths:
+            matcher.match_index(path)
+        compiled = time.perf_counter() - start
+
+        results.append({
+            'patterns': count,
+            'naive_us': naive / paths * 1e6,
+            'compiled_us': compiled / paths * 1e6,
+            'compile_ms': compile_time * 1000,
+            'automaton': matcher.use_automaton
+        })
+
+    return results
+
+
+# Test function - Only runs when file is executed directly
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("🧬 PATH MATCHER - TEST MODE")
+    print("=" * 60 + "\n")
+
+    matcher = PathMatcher(['\\Temp\\', '\\AppData\\Local\\Temp\\', '\\Users\\Public\\'])
+    for test_path in ['C:\\Users\\bob\\AppData\\Local\\Temp\\x.exe', 'C:\\Windows\\System32\\svchost.exe']:
+        print(f"   {test_path:45} -> {matcher.first_match(test_path)}")
+
+    print("\n⏱️ BENCHMARK (µs per path):")
+    print(f"   {'Patterns':>8} {'Loop':>10} {'Compiled':>10} {'Compile':>10}")
+    for row in benchmark_matcher():
+        mode = 'automaton' if row['automaton'] else 'scan'
+        print(f"   {row['patterns']:>8} {row['naive_us']:>10.2f} {row['compiled_us']:>10.2f} "
+              f"{row['compile_ms']:>8.1f}ms  ({mode})")
+
+    print("\n✅ Path Matcher Test Complete!\n")
@@ -7,15 +7,18 @@ Provides process termination, whitelisting, and detailed analysis
 import psutil
 import hashlib
 import os
-from datetime import datetime
+
+from time_utils import format_timestamp
 
 
 class ProcessManager:
     """Advanced process management and control"""
     
-    def __init__(self):
+    def __init__(self, process_source=None):
         self.whitelist = self.load_whitelist()
         self.process_cache = {}
+        # Optional process_sources.ProcessSource - None means the live system
+        self.process_source = process_source
     
     def load_whitelist(self):
         """Load whitelisted processes from file"""
@@ -47,8 +50,27 @@ class ProcessManager:
         """Check if process is whitelisted"""
         return process_name.lower() in self.whitelist
     
+    def _is_live(self):
+        """Check if we are looking at the real system (not a replay/synthetic source)"""
+        return self.process_source is None or self.process_source.is_live
+    
+    def _not_live_result(self):
+        """Result for process control requests against a non-live source"""
+        return {
+            'success': False,
+            'message': f'Process control is not available for {self.process_source.name} process sources',
+            'error': 'NotLive'
+        }
+    
     def get_process_details(self, pid):
         """Get detailed information about a process"""
+        if not self._is_live():
+            details = self.process_source.get_process_details(pid)
+            if 'error' not in details:
+                details['is_whitelisted'] = self.is_whitelisted(details['name'])
+                details['risk_score'] = self.calculate_risk_score(details)
+            return details
+        
         try:
             proc = psutil.Process(pid)
             
@@ -78,7 +100,7 @@ class ProcessManager:
                 'num_threads': num_threads,
                 'num_connections': connections,
                 'file_hash_sha256': file_hash,
-                'create_time': datetime.fromtimestamp(proc.create_time()).strftime('%Y-%m-%d %H:%M:%S'),
+                'create_time': format_timestamp(proc.create_time()),
                 'username': proc.username() if proc.username() else 'N/A',
                 'cmdline': ' '.join(proc.cmdline()) if proc.cmdline() else 'N/A'
             }
@@ -148,6 +170,9 @@ class ProcessManager:
     
     def terminate_process(self, pid, force=False):
         """Terminate a process by PID"""
+        if not self._is_live():
+            return self._not_live_result()
+        
         try:
             proc = psutil.Process(pid)
             process_name = proc.name()
@@ -187,6 +212,9 @@ class ProcessManager:
     
     def suspend_process(self, pid):
         """Suspend a process"""
+        if not self._is_live():
+            return self._not_live_result()
+        
         try:
             proc = psutil.Process(pid)
             proc.suspend()
@@ -202,6 +230,9 @@ class ProcessManager:
     
     def resume_process(self, pid):
         """Resume a suspended process"""
+        if not self._is_live():
+            return self._not_live_result()
+        
         try:
             proc = psutil.Process(pid)
             proc.resume()
@@ -217,6 +248,9 @@ class ProcessManager:
     
     def get_process_network_info(self, pid):
         """Get network connections for a process"""
+        if not self._is_live():
+            return self._not_live_result()
+        
         try:
             proc = psutil.Process(pid)
             connections = proc.connections()
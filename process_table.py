@@ -0,0 +1,216 @@
+"""
+process_table.py
+Columnar Process Table - Compact, array-backed storage for process snapshots
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping
+
+from time_utils import now, parse_timestamp
+
+# Column value used for a missing parent PID (arrays can't hold None)
+NO_PPID = -1
+
+
+class ProcessRow(Mapping):
+    """
+    Read-only dict-like view of a single row in a ProcessTable
+    Supports proc['name'], proc.get('path'), keys(), items() like a process dict
+    """
+
+    __slots__ = ('_table', '_index')
+
+    KEYS = ('pid', 'name', 'ppid', 'path', 'user', 'create_time', 'timestamp')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key):
+        table = self._table
+        i = self._index
+
+        if key == 'pid':
+            return table.pids[i]
+        if key == 'name':
+            return table.names[i]
+        if key == 'ppid':
+            ppid = table.ppids[i]
+            return None if ppid == NO_PPID else ppid
+        if key == 'path':
+            return table.paths[i]
+        if key == 'user':
+            return table.users[i]
+        if key == 'create_time':
+            return table.create_times[i] or None
+        if key == 'timestamp':
+            return table.timestamp
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"ProcessRow({dict(self)!r})"
+
+
+class ProcessTable:
+    """
+    Process snapshot stored as parallel columns instead of a list of dicts
+
+    pid/ppid live in array('i'), create_time in array('d') (epoch seconds), and
+    name/path/user are interned strings so repeated values (svchost.exe,
+    C:\\Windows\\System32\\svchost.exe, NT AUTHORITY\\SYSTEM) are stored once.
+    Iterating, indexing and slicing the table yield ProcessRow views (a slice
+    is a list of rows), so code written for the list-of-dicts format keeps working.
+    """
+
+    def __init__(self, timestamp=None):
+        self.pids = array('i')
+        self.ppids = array('i')
+        self.create_times = array('d')
+        self.names = []
+        self.paths = []
+        self.users = []
+        self.timestamp = timestamp or now()  # Scan time shared by every row
+
+    @classmethod
+    def from_records(cls, processes):
+        """
+        Build a table from a list of process dictionaries (get_all_processes() format)
+        """
+        table = cls()
+        for proc in processes:
+            table.append(proc)
+        return table
+
+    def append(self, proc):
+        """
+        Append a process dictionary (get_all_processes() format) to the table
+        Lets a ProcessTable collect records from a streaming scan
+        """
+        # Older recordings store formatted strings
+        create_time = parse_timestamp(proc.get('create_time'))
+        self.add(proc['pid'], proc['name'], proc['ppid'], proc['path'], proc['user'], create_time)
+
+    def add(self, pid, name, ppid, path, user, create_time):
+        """
+        Append a process to the table
+        create_time is an epoch timestamp (float)
+        """
+        self.pids.append(pid)
+        self.ppids.append(NO_PPID if ppid is None else ppid)
+        self.create_times.append(create_time or 0.0)
+        self.names.append(_intern(name))
+        self.paths.append(_intern(path))
+        self.users.append(_intern(user))
+
+    def __len__(self):
+        return len(self.pids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ProcessRow(self, i) for i in range(*index.indices(len(self.pids)))]
+        if index < 0:
+            index += len(self.pids)
+        if not 0 <= index < len(self.pids):
+            raise IndexError('process table index out of range')
+        return ProcessRow(self, index)
+
+    def __iter__(self):
+        for i in range(len(self.pids)):
+            yield ProcessRow(self, i)
+
+    def to_dicts(self):
+        """
+        Convert the table back to a list of process dictionaries
+        """
+        return [dict(row) for row in self]
+
+    def memory_usage(self):
+        """
+        Approximate memory used by the table in bytes
+        Interned strings are counted once, since they are shared between rows
+        """
+        total = sum(sys.getsizeof(col) for col in (self.pids, self.ppids, self.create_times,
+                                                   self.names, self.paths, self.users))
+        unique_strings = {id(s): s for col in (self.names, self.paths, self.users) for s in col if s}
+        total += sum(sys.getsizeof(s) for s in unique_strings.values())
+        return total
+
+
+def _intern(value):
+    """
+    Intern strings so identical names/paths/users share one object
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def measure_memory(processes):
+    """
+    Measure memory of a snapshot as list-of-dicts vs ProcessTable
+    Every dict value is counted per record, since psutil hands back a fresh
+    string object for each process
+    Returns: Dictionary with total and per-process byte counts
+    """
+    count = max(len(processes), 1)
+
+    dict_bytes = sys.getsizeof(processes)
+    for proc in processes:
+        dict_bytes += sys.getsizeof(proc)
+        dict_bytes += sum(sys.getsizeof(value) for value in proc.values())
+
+    table_bytes = ProcessTable.from_records(processes).memory_usage()
+
+    return {
+        'processes': len(processes),
+        'dict_bytes': dict_bytes,
+        'table_bytes': table_bytes,
+        'dict_bytes_per_process': dict_bytes / count,
+        'table_bytes_per_process': table_bytes / count
+    }
+
+
+# Test function - Only runs when file is executed directly
+if __name__ == "__main__":
+    import random
+
+    print("\n" + "=" * 60)
+    print("📦 PROCESS TABLE - TEST MODE")
+    print("=" * 60 + "\n")
+
+    # Simulated snapshot - process names, paths and users repeat heavily on real hosts
+    rng = random.Random(42)
+    names = ['svchost.exe', 'chrome.exe', 'conhost.exe', 'RuntimeBroker.exe', 'explorer.exe', 'python.exe']
+    users = ['NT AUTHORITY\\SYSTEM', 'NT AUTHORITY\\LOCAL SERVICE', 'DESKTOP\\user']
+    scan_time = now()
+
+    sample = []
+    for pid in range(4, 40004, 4):
+        name = rng.choice(names)
+        sample.append({
+            'pid': pid,
+            'name': name,
+            'ppid': rng.randrange(4, pid + 4, 4),
+            'path': f'C:\\Windows\\System32\\{name}',
+            'user': rng.choice(users),
+            'create_time': scan_time - rng.randint(0, 86400),
+            'timestamp': scan_time
+        })
+
+    result = measure_memory(sample)
+    print(f"📊 MEMORY ({result['processes']} processes):")
+    print(f"   List of dicts : {result['dict_bytes'] / 1024:8.1f} KB "
+          f"({result['dict_bytes_per_process']:.0f} bytes/process)")
+    print(f"   ProcessTable  : {result['table_bytes'] / 1024:8.1f} KB "
+          f"({result['table_bytes_per_process']:.0f} bytes/process)")
+
+    table = ProcessTable.from_records(sample)
+    row = table[0]
+    print(f"\n📋 SAMPLE ROW: {row['name']} (PID: {row['pid']}, PPID: {row['ppid']})")
+
+    print("\n✅ Process Table Test Complete!\n")
@@ -5,6 +5,11 @@ Report Generation Module - Creates detailed HTML security reports
 
 from datetime import datetime
 
+from alert_tiers import TieredAlertList
+from time_utils import format_timestamp
+
+SEVERITY_ORDER = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+
 
 class ReportGenerator:
     """
@@ -25,11 +30,12 @@ class ReportGenerator:
         if filename is None:
             filename = f'security_report_{self.timestamp}.html'
 
-        html_content = self._build_html()
-
         try:
+            # Written piece by piece so a spilled alert list never has to be
+            # held in memory (or as one HTML string) all at once
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+                for part in self._iter_html():
+                    f.write(part)
 
             print(f"[+] HTML report generated: {filename}")
             return filename
@@ -37,11 +43,12 @@ class ReportGenerator:
             print(f"[!] Error generating HTML report: {e}")
             return None
 
-    def _build_html(self):
+    def _iter_html(self):
         """
         Build the complete HTML report structure
+        Returns: Generator of HTML fragments, in document order
         """
-        html = f"""<!DOCTYPE html>
+        yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -56,12 +63,13 @@ class ReportGenerator:
         {self._build_header()}
         {self._build_summary_section()}
         {self._build_severity_breakdown()}
-        {self._build_alerts_section()}
+"""
+        yield from self._iter_alerts_section()
+        yield f"""
         {self._build_footer()}
     </div>
 </body>
 </html>"""
-        return html
 
     def _get_css_styles(self):
         """
@@ -360,12 +368,39 @@ class ReportGenerator:
         </div>
         """
 
-    def _build_alerts_section(self):
+    def _iter_sorted_alerts(self):
+        """
+        Alerts grouped by severity, most severe first. A TieredAlertList is
+        streamed one severity at a time, skipping spilled segments without
+        that severity, instead of being sorted as a whole.
+        Returns: Generator of alerts
+        """
+        if not isinstance(self.alerts, TieredAlertList):
+            yield from sorted(self.alerts, key=lambda x: SEVERITY_ORDER.index(x.get('severity', 'LOW'))
+                              if x.get('severity', 'LOW') in SEVERITY_ORDER else len(SEVERITY_ORDER))
+            return
+
+        for severity in SEVERITY_ORDER:
+            # Alerts without a severity are reported as LOW
+            held = {severity, None} if severity == 'LOW' else {severity}
+            skip = lambda segment, held=held: not any(segment['severity'][name] for name in held)
+            for _, alert in self.alerts.iter_from(skip_segment=skip):
+                if alert.get('severity', 'LOW') == severity:
+                    yield alert
+
+        # Anything with an unrecognised severity goes last, as in the sort
+        skip = lambda segment: not (set(segment['severity']) - set(SEVERITY_ORDER) - {None})
+        for _, alert in self.alerts.iter_from(skip_segment=skip):
+            if alert.get('severity', 'LOW') not in SEVERITY_ORDER:
+                yield alert
+
+    def _iter_alerts_section(self):
         """
         Build detailed alerts section
+        Returns: Generator of HTML fragments, one per alert card
         """
-        if not self.alerts:
-            return """
+        if not len(self.alerts):
+            yield """
             <div class="content">
                 <h2>🔍 Detailed Alerts</h2>
                 <div class="no-alerts">
@@ -373,16 +408,16 @@ class ReportGenerator:
                 </div>
             </div>
             """
+            return
 
-        # Sort alerts by severity
-        severity_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
-        sorted_alerts = sorted(self.alerts,
-                               key=lambda x: severity_order.get(x.get('severity', 'LOW'), 4))
-
-        alerts_html = ""
-        for idx, alert in enumerate(sorted_alerts, 1):
+        yield f"""
+        <div class="content">
+            <div class="alerts-section">
+                <h2>🔍 Detailed Alerts ({len(self.alerts)} total)</h2>
+        """
+        for idx, alert in enumerate(self._iter_sorted_alerts(), 1):
             severity = alert.get('severity', 'LOW').lower()
-            alerts_html += f"""
+            yield f"""
             <div class="alert-card alert-{severity}">
                 <div class="alert-header">
                     <div class="alert-title">Alert #{idx}: {alert.get('type', 'Unknown Alert')}</div>
@@ -396,12 +431,7 @@ class ReportGenerator:
                 </div>
             </div>
             """
-
-        return f"""
-        <div class="content">
-            <div class="alerts-section">
-                <h2>🔍 Detailed Alerts ({len(self.alerts)} total)</h2>
-                {alerts_html}
+        yield """
             </div>
         </div>
         """
@@ -414,7 +444,10 @@ class ReportGenerator:
 
         # Common fields
         if 'timestamp' in alert:
-            details.append(f'<div><span class="detail-label">Timestamp:</span> {alert["timestamp"]}</div>')
+            details.append(f'<div><span class="detail-label">Timestamp:</span> {format_timestamp(alert["timestamp"])}</div>')
+        if alert.get('occurrences', 1) > 1:
+            details.append(f'<div><span class="detail-label">Seen:</span> {alert["occurrences"]} times, '
+                           f'last at {format_timestamp(alert["last_seen"])}</div>')
 
         # Process-specific fields
         if 'process_name' in alert:
@@ -432,6 +465,9 @@ class ReportGenerator:
             details.append(
                 f'<div><span class="detail-label">Child Process:</span> {alert["child_name"]} (PID: {alert.get("child_pid", "N/A")})</div>')
 
+        if 'chain' in alert:
+            details.append(f'<div><span class="detail-label">Process Chain:</span> {alert["chain"]}</div>')
+
         # Service-specific
         if 'service_name' in alert:
             details.append(f'<div><span class="detail-label">Service Name:</span> {alert["service_name"]}</div>')
@@ -5,7 +5,7 @@ Service Monitoring Module - Enumerates and analyzes Windows services
 
 import win32service
 import win32serviceutil
-from datetime import datetime
+from time_utils import now
 
 
 def enumerate_services():
@@ -17,6 +17,8 @@ def enumerate_services():
 
     print("[*] Scanning Windows services...")
 
+    scan_time = now()  # Shared by every service in this scan
+
     try:
         # Open Service Control Manager
         accessSCM = win32service.OpenSCManager(None, None, win32service.SC_MANAGER_ENUMERATE_SERVICE)
@@ -62,7 +64,7 @@ def enumerate_services():
                 'state': state_str,
                 'path': service_path,
                 'startup_type': startup_type,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': scan_time
             }
 
             services.append(service_info)
@@ -0,0 +1,114 @@
+"""
+verdict_cache.py
+Verdict Cache - Remembers which per-process rules fire for a (name, path, parent name, user) tuple
+Most processes are identical across scans and hosts, so their rules only need evaluating once
+"""
+
+from collections import OrderedDict
+
+
+class VerdictCache:
+    """
+    LRU cache of rule verdicts
+
+    A verdict is the tuple of rule categories that fired for a key (usually
+    empty). The cache is bound to a fingerprint of the rule set and whitelist;
+    validate() with a different fingerprint drops every entry, so a rule change
+    never serves a stale verdict.
+    """
+
+    def __init__(self, max_entries=65536):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.fingerprint = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def validate(self, fingerprint):
+        """
+        Drop all verdicts if the rules/whitelist fingerprint changed
+        Returns: True if the cache was invalidated
+        """
+        if fingerprint == self.fingerprint:
+            return False
+        if self.fingerprint is not None:
+            self.invalidations += 1
+        self.entries.clear()
+        self.fingerprint = fingerprint
+        return True
+
+    def get(self, key):
+        """
+        Look up a verdict (and mark it most recently used)
+        Returns: Verdict tuple, or None on a miss
+        """
+        verdict = self.entries.get(key)
+        if verdict is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return verdict
+
+    def put(self, key, verdict):
+        """
+        Store a verdict, evicting the least recently used entry when full
+        """
+        self.entries[key] = verdict
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drop all verdicts (counters are kept)
+        """
+        self.entries.clear()
+
+    def get_stats(self):
+        """
+        Hit/miss ratio and eviction counts, for sizing the cache
+        Returns: Dictionary of stats
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
+
+
+# Test function - Only runs when file is executed directly
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("🗃️ VERDICT CACHE - TEST MODE")
+    print("=" * 60 + "\n")
+
+    cache = VerdictCache(max_entries=2)
+    cache.validate('rules-v1')
+
+    svchost = ('svchost.exe', 'c:\\windows\\system32\\svchost.exe', 'services.exe', 'SYSTEM')
+    cache.put(svchost, ())
+    print(f"   svchost verdict: {cache.get(svchost)}")
+
+    for i in range(3):
+        cache.put((f'tool{i}.exe', f'c:\\temp\\tool{i}.exe', 'cmd.exe', 'bob'), ('suspicious_paths',))
+    print(f"   svchost after 3 inserts into 2 slots: {cache.get(svchost)}")
+
+    cache.validate('rules-v2')
+    print(f"   Entries after rule change: {len(cache)}")
+
+    stats = cache.get_stats()
+    print(f"\n📊 Hits: {stats['hits']}, misses: {stats['misses']}, "
+          f"evictions: {stats['evictions']}, invalidations: {stats['invalidations']}")
+
+    print("\n✅ Verdict Cache Test Complete!\n")
@@ -1853,29 +1853,40 @@
 # </body></html>'''
 
 
-from flask import Flask, render_template_string, jsonify, send_file, request
+from flask import Flask, Response, render_template_string, jsonify, send_file, request
 import threading
 import webbrowser
 import time
 from datetime import datetime
 
-from core_mon import get_all_processes, build_process_tree
-from service_mon import enumerate_services
-from detect_rules import run_all_detections
+from core_mon import build_process_tree, build_tree_index, diff_snapshots, ProcessIndex
+from process_sources import LiveProcessSource, LiveServiceSource
+from detect_rules import (run_streaming_detections, run_delta_detections, detect_suspicious_services,
+                          service_fingerprint, record_rule_pass, enable_rule_profiling, get_rule_stats)
 from alert_sys import AlertManager
+from alert_journal import AlertJournal
+from alert_store import AlertStore, PAGE_SIZE
 from report_gen import ReportGenerator
 from process_manager_advanced import ProcessManager
 from threat_intel import ThreatIntelligence
+from process_table import ProcessTable
+from time_utils import serialize_alert
+from scan_scheduler import AdaptiveScanScheduler
+from parallel_detect import ParallelDetector
+from verdict_cache import VerdictCache
 
 
 class WebDashboard:
-    def __init__(self):
+    def __init__(self, process_source=None, service_source=None, rule_engine=None, temporal_engine=None,
+                 journal_dir=None, alert_db=None, memory_budget=None, spill_dir=None, parallel_workers=None):
         self.app = Flask(__name__)
+        self.process_source = process_source or LiveProcessSource()
+        self.service_source = service_source or LiveServiceSource()
         self.scan_complete = False
         self.scan_progress = 0
         self.current_step = "Initializing..."
         self.alert_manager = None
-        self.process_manager = ProcessManager()
+        self.process_manager = ProcessManager(self.process_source)
         self.threat_intel = ThreatIntelligence()
         self.processes_count = 0
         self.services_count = 0
@@ -1883,8 +1894,32 @@ class WebDashboard:
         self.services_data = []
         self.process_tree = {}
         self.pid_to_process = {}
+        self.tree_index = None
+        self.process_index = ProcessIndex()
+        self.process_snapshot = {}  # (pid, create_time) -> process from the last scan
+        self.service_state = {}     # service name -> fingerprint from the last scan
+        self.last_churn = 0
+        self.scheduler = None
+        self.rule_engine = rule_engine
+        self.temporal_engine = temporal_engine
+        self.journal_dir = journal_dir  # Each full scan journals its alerts to a new JSONL file here
+        self.alert_store = AlertStore(alert_db) if alert_db else None  # Alerts of every run, across restarts
+        self.memory_budget = memory_budget  # Alerts kept in RAM - older ones spill to spill_dir
+        self.spill_dir = spill_dir
+        # Full scans shard the per-process rules over worker processes (large snapshots)
+        self.parallel_detector = ParallelDetector(parallel_workers) if parallel_workers else None
+        # Name/path rule verdicts, kept across scans - rescans mostly see known processes
+        self.verdict_cache = VerdictCache()
         self.setup_routes()
 
+    def enable_continuous_scanning(self, **options):
+        """
+        Keep rescanning with an adaptive interval instead of scanning once
+        options: AdaptiveScanScheduler settings (min_interval, max_interval, cpu_budget, ...)
+        """
+        self.scheduler = AdaptiveScanScheduler(self.run_scan_cycle, **options)
+        return self.scheduler
+
     def setup_routes(self):
         @self.app.route('/')
         def dashboard():
@@ -1905,15 +1940,65 @@ class WebDashboard:
         @self.app.route('/api/alerts')
         def get_alerts():
             if self.alert_manager:
-                return jsonify({'alerts': self.alert_manager.alerts, 'summary': self.alert_manager.get_summary()})
+                # Alerts held in memory - with a memory budget, older ones are served by /api/alerts/page
+                return jsonify({'alerts': [serialize_alert(a) for a in self.alert_manager.get_recent_alerts()], 'summary': self.alert_manager.get_summary()})
             return jsonify({'alerts': [], 'summary': {}})
 
+        @self.app.route('/api/alerts/page')
+        def get_alerts_page():
+            """
+            One page of alerts, filtered by ?severity=&type=&pid=&process_name=&since= (epoch)
+            Pass ?cursor=<next_cursor> for the next page; ?newest_first=1 to page backwards
+            """
+            if not self.alert_manager:
+                return jsonify({'alerts': [], 'next_cursor': None})
+            args = request.args
+            alerts, next_cursor = self.alert_manager.query_alerts(
+                severity=args.get('severity'), alert_type=args.get('type'), pid=args.get('pid', type=int),
+                process_name=args.get('process_name'), since=args.get('since', type=float),
+                cursor=args.get('cursor', type=int), limit=args.get('limit', PAGE_SIZE, type=int),
+                newest_first=args.get('newest_first') == '1')
+            return jsonify({'alerts': [serialize_alert(a) for a in alerts], 'next_cursor': next_cursor})
+
+        @self.app.route('/api/scheduler-stats')
+        def get_scheduler_stats():
+            if not self.scheduler:
+                return jsonify({'running': False, 'continuous': False})
+            stats = self.scheduler.get_stats()
+            stats['continuous'] = True
+            return jsonify(stats)
+
+        @self.app.route('/api/rules')
+        def get_rules():
+            if not self.rule_engine:
+                return jsonify({'rules': 0, 'per_rule': []})
+            return jsonify(self.rule_engine.get_stats())
+
+        @self.app.route('/api/rule-stats')
+        def get_rule_profile():
+            stats = get_rule_stats()
+            if stats is None:
+                return jsonify({'enabled': False, 'rules': [], 'noisy_rules': [],
+                                'verdict_cache': self.verdict_cache.get_stats()})
+            stats['enabled'] = True
+            stats['verdict_cache'] = self.verdict_cache.get_stats()
+            if self.rule_engine:
+                stats['custom_rules'] = self.rule_engine.get_stats()['per_rule']
+            return jsonify(stats)
+
+        @self.app.route('/api/temporal-rules')
+        def get_temporal_rules():
+            if not self.temporal_engine:
+                return jsonify({'events': 0, 'rules': []})
+            return jsonify(self.temporal_engine.get_stats())
+
         @self.app.route('/api/process-tree')
         def get_process_tree():
             if self.scan_complete:
+                process_tree, pid_to_process, tree_index = self.process_tree, self.pid_to_process, self.tree_index
                 tree_data = []
-                for parent_pid, children in self.process_tree.items():
-                    parent_info = self.pid_to_process.get(parent_pid,
+                for parent_pid, children in process_tree.items():
+                    parent_info = pid_to_process.get(parent_pid,
                                                           {'pid': parent_pid, 'name': 'Unknown', 'path': 'N/A'})
                     tree_data.append({
                         'parent': {
@@ -1931,12 +2016,67 @@ class WebDashboard:
                             }
                             for c in children
                         ],
-                        'child_count': len(children)
+                        'child_count': len(children),
+                        'descendant_count': tree_index.descendant_count(parent_pid) if tree_index else len(children)
                     })
                 tree_data.sort(key=lambda x: x['child_count'], reverse=True)
-                return jsonify({'tree': tree_data[:50], 'total_parents': len(self.process_tree)})
+                return jsonify({'tree': tree_data[:50], 'total_parents': len(process_tree)})
             return jsonify({'tree': [], 'total_parents': 0})
 
+        @self.app.route('/api/process-subtree/<int:pid>')
+        def get_process_subtree(pid):
+            tree_index = self.tree_index
+            if not tree_index or pid not in tree_index:
+                return jsonify({'error': f'Process {pid} not found in last scan'}), 404
+            subtree = [
+                {
+                    'pid': p.get('pid'),
+                    'ppid': tree_index.parent_of(p.get('pid')),
+                    'name': p.get('name'),
+                    'path': p.get('path', 'N/A'),
+                    'user': p.get('user', 'N/A')
+                }
+                for p in tree_index.subtree(pid)
+            ]
+            return jsonify({'pid': pid, 'processes': subtree, 'descendant_count': len(subtree) - 1})
+
+        @self.app.route('/api/process-ancestry/<int:pid>')
+        def get_process_ancestry(pid):
+            # Names come from the index's own records, so they always match its PIDs
+            tree_index = self.tree_index
+            if not tree_index or pid not in tree_index:
+                return jsonify({'error': f'Process {pid} not found in last scan'}), 404
+            chain = [
+                {'pid': p, 'name': tree_index.pid_to_process[p].get('name')}
+                for p in tree_index.ancestors(pid)
+            ]
+            return jsonify({'pid': pid, 'ancestors': chain})
+
+        @self.app.route('/api/processes/search')
+        def search_processes():
+            name = request.args.get('name')
+            prefix = request.args.get('prefix')
+            path = request.args.get('path')
+            user = request.args.get('user')
+            if name:
+                matches = self.process_index.find_by_name(name)
+            elif prefix:
+                matches = self.process_index.find_by_name_prefix(prefix)
+            elif path:
+                matches = self.process_index.find_by_path(path)
+            elif user:
+                matches = self.process_index.find_by_user(user)
+            else:
+                return jsonify({'error': 'Provide one of name, prefix, path or user'}), 400
+            return jsonify({
+                'processes': [
+                    {'pid': p.get('pid'), 'ppid': p.get('ppid'), 'name': p.get('name'),
+                     'path': p.get('path', 'N/A'), 'user': p.get('user', 'N/A')}
+                    for p in matches
+                ],
+                'total': len(matches)
+            })
+
         @self.app.route('/api/process-details/<int:pid>')
         def get_process_details(pid):
             details = self.process_manager.get_process_details(pid)
@@ -1970,44 +2110,108 @@ class WebDashboard:
 
         @self.app.route('/download/json')
         def download_json():
+            if self.alert_manager and self.alert_manager.journal:
+                # Streamed from the journal - alerts were serialized once, when raised
+                return Response(self.alert_manager.journal.iter_export_json(self.alert_manager.get_summary()),
+                                mimetype='application/json',
+                                headers={'Content-Disposition': 'attachment; filename=security_alerts.json'})
             if self.alert_manager:
                 filename = 'security_alerts.json'
                 self.alert_manager.export_json(filename)
                 return send_file(filename, as_attachment=True)
             return "No data available", 404
 
-    def run_scan_async(self):
+        @self.app.route('/download/jsonl')
+        def download_jsonl():
+            if self.alert_manager and self.alert_manager.journal:
+                journal = self.alert_manager.journal
+                journal.sync()
+                return send_file(journal.path, as_attachment=True, mimetype='application/x-ndjson')
+            return "No journal available (start with --journal DIR)", 404
+
+        @self.app.route('/api/alerts/tail')
+        def tail_alerts():
+            """
+            Alerts journaled since ?offset= (pass back next_offset to follow) - 'updates'
+            carries repeat counts for alerts from earlier calls, by their journal_offset
+            """
+            if not (self.alert_manager and self.alert_manager.journal):
+                return jsonify({'error': 'No journal available (start with --journal DIR)'}), 404
+            journal = self.alert_manager.journal
+            offset = request.args.get('offset', 0, type=int)
+            if offset < 0 or offset > journal.offset:
+                return jsonify({'error': 'Offset outside the journal'}), 400
+            alerts, next_offset, updates = journal.tail(offset, limit=request.args.get('limit', 1000, type=int))
+            return jsonify({'journal': journal.path, 'alerts': alerts, 'next_offset': next_offset,
+                            'updates': updates})
+
+    def run_scan_async(self, pace=True):
+        # Short pauses let the dashboard show each step - skipped for continuous rescans
+        pause = 0.5 if pace else 0
         try:
-            self.current_step = "🔍 Scanning processes..."
+            self.current_step = "🔍 Scanning processes & running detections..."
             self.scan_progress = 20
-            processes = get_all_processes()
+            if self.alert_manager:
+                self.alert_manager.close()
+            journal = AlertJournal.for_run(self.journal_dir) if self.journal_dir else None
+            self.alert_manager = AlertManager(journal=journal, store=self.alert_store,
+                                              memory_budget=self.memory_budget, spill_dir=self.spill_dir)
+
+            # Process rules fire while enumeration is still running - live hosts
+            # collect into a compact ProcessTable
+            collector = ProcessTable() if self.process_source.is_live else None
+            if self.parallel_detector is None:
+                _, processes = run_streaming_detections(self.process_source.iter_processes(),
+                                                        on_alert=self.alert_manager.add_alert,
+                                                        collector=collector,
+                                                        rule_engine=self.rule_engine,
+                                                        verdict_cache=self.verdict_cache)
+            else:
+                # Whole snapshot first - detections run sharded once the tree is built
+                processes = collector if collector is not None else []
+                for proc in self.process_source.iter_processes():
+                    processes.append(proc)
             self.processes_count = len(processes)
             self.processes_data = processes
-            time.sleep(0.5)
+            delta, self.process_snapshot = diff_snapshots(self.process_snapshot, processes)
+            self.last_churn = len(delta['started']) + len(delta['exited'])
+            time.sleep(pause)
 
             self.current_step = "🌳 Building process tree..."
             self.scan_progress = 40
             process_tree, pid_to_process = build_process_tree(processes)
-            self.process_tree = process_tree
-            self.pid_to_process = pid_to_process
-            time.sleep(0.5)
+            tree_index = build_tree_index(processes)
+            # Published together - request handlers look PIDs up in both
+            self.process_tree, self.pid_to_process, self.tree_index = process_tree, pid_to_process, tree_index
+            self.process_index = ProcessIndex(processes)
+            if self.parallel_detector is not None:
+                results = self.parallel_detector.run(processes, process_tree, pid_to_process, [],
+                                                     tree_index, self.rule_engine)
+                for alerts in results.values():
+                    for alert in alerts:
+                        self.alert_manager.add_alert(alert)
+            time.sleep(pause)
 
             self.current_step = "⚙️ Scanning services..."
             self.scan_progress = 60
-            services = enumerate_services()
+            services = self.service_source.get_services()
             self.services_count = len(services)
             self.services_data = services
-            time.sleep(0.5)
+            self.service_state = {svc['name']: service_fingerprint(svc) for svc in services}
+            time.sleep(pause)
 
-            self.current_step = "🔍 Running security detections..."
+            self.current_step = "🔍 Checking service configurations..."
             self.scan_progress = 80
-            self.alert_manager = AlertManager()
-            all_alerts = run_all_detections(processes, process_tree, pid_to_process, services)
-
-            for alert_type, alerts_list in all_alerts.items():
-                for alert in alerts_list:
-                    self.alert_manager.add_alert(alert)
-            time.sleep(0.5)
+            start = time.perf_counter()
+            service_alerts = detect_suspicious_services(services)
+            record_rule_pass('suspicious_services', len(services), service_alerts, time.perf_counter() - start)
+            for alert in service_alerts:
+                self.alert_manager.add_alert(alert)
+            if self.rule_engine:
+                for svc in services:
+                    for alert in self.rule_engine.check_service(svc):
+                        self.alert_manager.add_alert(alert)
+            time.sleep(pause)
 
             self.current_step = "✅ Scan complete!"
             self.scan_progress = 100
@@ -2016,8 +2220,58 @@ class WebDashboard:
             self.current_step = f"❌ Error: {str(e)}"
             self.scan_complete = True
 
+    def run_delta_scan(self):
+        """
+        Rescan, but only run detections for processes and services that changed
+        New alerts are added to the existing alert manager
+        """
+        try:
+            self.current_step = "🔄 Rescanning (changes only)..."
+            # Live sources only read new processes in full (IncrementalScanner)
+            delta, self.process_snapshot = self.process_source.scan_changes(self.process_snapshot)
+            if delta['started'] or delta['exited'] or delta['changed']:
+                # Rebuilt in memory from the snapshot - no process is read again
+                processes = list(self.process_snapshot.values())
+                process_tree, pid_to_process = build_process_tree(processes)
+                self.process_index.apply_delta(delta)
+                tree_index = build_tree_index(processes)
+            else:
+                processes, process_tree, pid_to_process = self.processes_data, self.process_tree, self.pid_to_process
+                tree_index = self.tree_index
+
+            services = self.service_source.get_services()
+            run_delta_detections(delta, pid_to_process, process_tree, services, self.service_state,
+                                 rule_engine=self.rule_engine, on_alert=self.alert_manager.add_alert,
+                                 temporal_engine=self.temporal_engine, verdict_cache=self.verdict_cache)
+
+            self.processes_count = len(processes)
+            self.processes_data = processes
+            # Published together - request handlers look PIDs up in both
+            self.process_tree, self.pid_to_process, self.tree_index = process_tree, pid_to_process, tree_index
+            self.services_count = len(services)
+            self.services_data = services
+            self.last_churn = len(delta['started']) + len(delta['exited'])
+            self.current_step = "✅ Scan complete!"
+        except Exception as e:
+            self.current_step = f"❌ Error: {str(e)}"
+
+    def run_scan_cycle(self):
+        """
+        One scheduled scan - the first is a full paced scan, later ones only
+        check what changed
+        Returns: Number of processes started or exited since the previous scan
+        """
+        if self.scheduler.scans == 0 or self.alert_manager is None:
+            self.run_scan_async(pace=self.scheduler.scans == 0)
+        else:
+            self.run_delta_scan()
+        return self.last_churn
+
     def start_scan(self):
-        threading.Thread(target=self.run_scan_async, daemon=True).start()
+        if self.scheduler:
+            self.scheduler.start()
+        else:
+            threading.Thread(target=self.run_scan_async, daemon=True).start()
 
     def run_server(self, port=5000):
         self.start_scan()
@@ -2034,9 +2288,19 @@ class WebDashboard:
         self.app.run(port=port, debug=False, use_reloader=False)
 
 
-def run_web_dashboard():
-    dashboard = WebDashboard()
-    dashboard.run_server(port=5000)
+def run_web_dashboard(process_source=None, service_source=None, port=5000, continuous=False,
+                      rule_engine=None, profile_rules=False, temporal_engine=None, journal_dir=None,
+                      alert_db=None, memory_budget=None, spill_dir=None, parallel_workers=None,
+                      **scheduler_options):
+    if profile_rules:
+        enable_rule_profiling()
+        if rule_engine:
+            rule_engine.profile = True
+    dashboard = WebDashboard(process_source, service_source, rule_engine, temporal_engine, journal_dir, alert_db,
+                             memory_budget, spill_dir, parallel_workers)
+    if continuous:
+        dashboard.enable_continuous_scanning(**scheduler_options)
+    dashboard.run_server(port=port)
 
 
 if __name__ == "__main__":
@@ -2175,7 +2439,7 @@ function whitelistProcess(name){fetch('/api/whitelist-process',{method:'POST',he
 function closeModal(){document.getElementById('processModal').classList.remove('show')}
 function showHelp(){document.getElementById('helpModal').classList.add('show')}
 function closeHelpModal(){document.getElementById('helpModal').classList.remove('hidden')}
-function loadFullDetails(){fetch('/api/alerts').then(r=>r.json()).then(d=>{document.getElementById('severitySection').classList.remove('hidden');updateSeverityBars(d.summary);document.getElementById('alertCount').textContent=d.alerts.length;const list=document.getElementById('alertsList');if(d.alerts.length===0){list.innerHTML='<div style="background:linear-gradient(135deg,#56ab2f,#a8e063);color:#fff;padding:40px;border-radius:15px;text-align:center;font-size:1.3em;margin:20px 0">✅ No security threats detected! Your system appears clean.</div>'}else{const order={'CRITICAL':0,'HIGH':1,'MEDIUM':2,'LOW':3};d.alerts.sort((a,b)=>order[a.severity]-order[b.severity]);list.innerHTML=d.alerts.map((a,i)=>{let details='';if(a.timestamp)details+=`<div><span class="detail-label">Time:</span><span>${a.timestamp}</span></div>`;if(a.process_name)details+=`<div><span class="detail-label">Process:</span><span>${a.process_name}</span></div>`;if(a.pid)details+=`<div><span class="detail-label">PID:</span><span>${a.pid}</span></div>`;if(a.path)details+=`<div><span class="detail-label">Path:</span><span style="word-break:break-all">${a.path}</span></div>`;if(a.parent_name)details+=`<div><span class="detail-label">Parent:</span><span>${a.parent_name} (PID: ${a.parent_pid||'N/A'})</span></div>`;if(a.child_name)details+=`<div><span class="detail-label">Child:</span><span>${a.child_name} (PID: ${a.child_pid||'N/A'})</span></div>`;if(a.child_path)details+=`<div><span class="detail-label">Child Path:</span><span style="word-break:break-all">${a.child_path}</span></div>`;if(a.service_name)details+=`<div><span class="detail-label">Service:</span><span>${a.service_name}</span></div>`;if(a.display_name)details+=`<div><span class="detail-label">Display:</span><span>${a.display_name}</span></div>`;if(a.state)details+=`<div><span class="detail-label">State:</span><span>${a.state}</span></div>`;if(a.startup_type)details+=`<div><span class="detail-label">Startup:</span><span>${a.startup_type}</span></div>`;return`<div class="alert-item alert-${a.severity.toLowerCase()}"><div class="alert-header"><div class="alert-title">Alert #${i+1}: ${a.type}</div><div class="alert-badge badge-${a.severity.toLowerCase()}">${a.severity}</div></div><div style="color:#555;line-height:1.6;margin-bottom:10px">${a.description}</div>${details?`<div class="alert-details">${details}</div>`:''}</div>`}).join('')}document.getElementById('alertsSection').classList.remove('hidden')})}
+function loadFullDetails(){fetch('/api/alerts').then(r=>r.json()).then(d=>{document.getElementById('severitySection').classList.remove('hidden');updateSeverityBars(d.summary);document.getElementById('alertCount').textContent=d.alerts.length;const list=document.getElementById('alertsList');if(d.alerts.length===0){list.innerHTML='<div style="background:linear-gradient(135deg,#56ab2f,#a8e063);color:#fff;padding:40px;border-radius:15px;text-align:center;font-size:1.3em;margin:20px 0">✅ No security threats detected! Your system appears clean.</div>'}else{const order={'CRITICAL':0,'HIGH':1,'MEDIUM':2,'LOW':3};d.alerts.sort((a,b)=>order[a.severity]-order[b.severity]);list.innerHTML=d.alerts.map((a,i)=>{let details='';if(a.timestamp)details+=`<div><span class="detail-label">Time:</span><span>${a.timestamp}</span></div>`;if(a.process_name)details+=`<div><span class="detail-label">Process:</span><span>${a.process_name}</span></div>`;if(a.pid)details+=`<div><span class="detail-label">PID:</span><span>${a.pid}</span></div>`;if(a.path)details+=`<div><span class="detail-label">Path:</span><span style="word-break:break-all">${a.path}</span></div>`;if(a.chain)details+=`<div><span class="detail-label">Chain:</span><span>${a.chain}</span></div>`;if(a.parent_name)details+=`<div><span class="detail-label">Parent:</span><span>${a.parent_name} (PID: ${a.parent_pid||'N/A'})</span></div>`;if(a.child_name)details+=`<div><span class="detail-label">Child:</span><span>${a.child_name} (PID: ${a.child_pid||'N/A'})</span></div>`;if(a.child_path)details+=`<div><span class="detail-label">Child Path:</span><span style="word-break:break-all">${a.child_path}</span></div>`;if(a.service_name)details+=`<div><span class="detail-label">Service:</span><span>${a.service_name}</span></div>`;if(a.display_name)details+=`<div><span class="detail-label">Display:</span><span>${a.display_name}</span></div>`;if(a.state)details+=`<div><span class="detail-label">State:</span><span>${a.state}</span></div>`;if(a.startup_type)details+=`<div><span class="detail-label">Startup:</span><span>${a.startup_type}</span></div>`;return`<div class="alert-item alert-${a.severity.toLowerCase()}"><div class="alert-header"><div class="alert-title">Alert #${i+1}: ${a.type}</div><div class="alert-badge badge-${a.severity.toLowerCase()}">${a.severity}</div></div><div style="color:#555;line-height:1.6;margin-bottom:10px">${a.description}</div>${details?`<div class="alert-details">${details}</div>`:''}</div>`}).join('')}document.getElementById('alertsSection').classList.remove('hidden')})}
 function updateSeverityBars(s){const t=s.total_alerts||1;const c=s.by_severity?.CRITICAL||0;const h=s.by_severity?.HIGH||0;const m=s.by_severity?.MEDIUM||0;const cp=(c/t*100).toFixed(1);const hp=(h/t*100).toFixed(1);const mp=(m/t*100).toFixed(1);document.getElementById('barCritical').style.width=cp+'%';document.getElementById('barCritical').textContent=cp+'%';document.getElementById('criticalCountText').textContent=c+' alerts';document.getElementById('barHigh').style.width=hp+'%';document.getElementById('barHigh').textContent=hp+'%';document.getElementById('highCountText').textContent=h+' alerts';document.getElementById('barMedium').style.width=mp+'%';document.getElementById('barMedium').textContent=mp+'%';document.getElementById('mediumCountText').textContent=m+' alerts'}
 setInterval(updateDashboard,1000);updateDashboard();
 </script>